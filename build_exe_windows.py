@@ -181,6 +181,12 @@ hiddenimports.extend([
     'duckdb',
     'journal_entry_analyzer',
     'db_engine',
+    'csv_encoding',
+    'preprocess_pipeline',
+    'query_cache',
+    'query_control',
+    'result_export',
+    'trx_hash',
 ])
 
 # 데이터 파일 수집
@@ -5,7 +5,8 @@ from pathlib import Path
 
 import streamlit as st
 
-from db_engine import DEFAULT_DB_PATH, GLEngine
+from db_engine import DEFAULT_DB_PATH, DEFAULT_QUERY_TIMEOUT_S, GLEngine
+from query_control import QUERY_TIMEOUT_KEY
 from tab_aggregation import render_aggregation_tab
 from tab_query import render_query_tab
 from tab_sql_query import render_sql_query_tab
@@ -13,14 +14,15 @@ from tab_sql_query import render_sql_query_tab
 
 # --------- Cached helpers --------- #
 @st.cache_resource(show_spinner=False)
-def get_engine(db_path: str) -> GLEngine:
-    return GLEngine(db_path)
+def get_engine(db_path: str, dataset_path: str = "") -> GLEngine:
+    """DB별로 하나의 엔진(읽기 전용 연결 유지)을 세션 간에 공유."""
+    return GLEngine(db_path, dataset_path or None)
 
 
 @st.cache_data(show_spinner=False)
-def get_table_columns(db_path: str) -> list[str]:
+def get_table_columns(db_path: str, dataset_path: str = "") -> list[str]:
     """Return column names of the general_ledger table."""
-    engine = GLEngine(db_path)
+    engine = get_engine(db_path, dataset_path)
     try:
         info = engine.run_query("PRAGMA table_info('general_ledger')")
     except Exception:
@@ -29,8 +31,19 @@ def get_table_columns(db_path: str) -> list[str]:
 
 
 @st.cache_data(show_spinner=False)
-def get_distinct_values(db_path: str, column: str, limit: int = 100) -> list[str]:
-    engine = GLEngine(db_path)
+def get_column_stats(db_path: str, dataset_path: str = "") -> dict[str, dict]:
+    """column_stats 카탈로그 {컬럼명: 통계}. 카탈로그가 없으면 빈 dict."""
+    engine = get_engine(db_path, dataset_path)
+    try:
+        return engine.column_stats()
+    except Exception:
+        return {}
+
+
+@st.cache_data(show_spinner=False)
+def get_distinct_values(db_path: str, column: str, limit: int = 100, dataset_path: str = "") -> list[str]:
+    """컬럼 값 목록 (원장 스캔). column_stats 카탈로그가 없을 때 컬럼 정보에서만 사용."""
+    engine = get_engine(db_path, dataset_path)
     try:
         df = engine.run_query(
             f'SELECT DISTINCT "{column}" AS val FROM general_ledger '
@@ -42,8 +55,8 @@ def get_distinct_values(db_path: str, column: str, limit: int = 100) -> list[str
 
 
 @st.cache_data(show_spinner=False)
-def get_total_count(db_path: str) -> int:
-    engine = GLEngine(db_path)
+def get_total_count(db_path: str, dataset_path: str = "") -> int:
+    engine = get_engine(db_path, dataset_path)
     try:
         df = engine.run_query("SELECT COUNT(*) AS cnt FROM general_ledger")
         return int(df["cnt"][0])
@@ -54,6 +67,34 @@ def get_total_count(db_path: str) -> int:
 
 
 # --------- UI --------- #
+def render_column_info(db_path: str, dataset_path: str, columns: list[str]) -> None:
+    """사이드바 컬럼 정보: 조건 작성 시 참고할 타입, NULL 비율, 고유값 수, 최소/최대와 자주 나오는 값."""
+    with st.sidebar.expander("🔎 컬럼 정보", expanded=False):
+        column = st.selectbox("컬럼", options=columns, key="column_info_col")
+        stats = get_column_stats(db_path, dataset_path).get(column)
+        if stats is None:
+            st.caption("컬럼 통계(column_stats)가 없습니다. `GLEngine().build_column_stats()`로 만들 수 있습니다.")
+            if st.button("값 예시 조회 (원장 스캔)", key="column_info_scan"):
+                st.caption(", ".join(get_distinct_values(db_path, column, 20, dataset_path)) or "값이 없습니다.")
+            return
+
+        null_pct = stats["null_count"] / stats["row_count"] * 100 if stats["row_count"] else 0.0
+        st.markdown(
+            f"- 타입: `{stats['column_type']}`\n"
+            f"- NULL: {stats['null_count']:,}행 ({null_pct:.1f}%)\n"
+            f"- 고유값 수 (근사): {stats['approx_distinct']:,}\n"
+            f"- 최소 / 최대: `{stats['min_value']}` / `{stats['max_value']}`"
+        )
+        if stats["top_values"]:
+            st.dataframe(
+                [{"값": item["value"], "행 수": item["count"]} for item in stats["top_values"]],
+                hide_index=True,
+                use_container_width=True,
+            )
+        else:
+            st.caption("값이 대부분 서로 달라 자주 나오는 값은 저장하지 않았습니다.")
+
+
 def main() -> None:
     st.set_page_config(page_title="GL Analyzer", layout="wide")
     st.title("📊 일반분개장 조회")
@@ -102,6 +143,21 @@ def main() -> None:
     db_path_input = st.sidebar.text_input(
         "DuckDB 파일 경로", value=str(default_db)
     ).strip()
+    dataset_path = st.sidebar.text_input(
+        "Parquet 데이터셋 폴더 (선택)",
+        value="",
+        placeholder="예: gl_dataset",
+        help="회계월별 Parquet 데이터셋을 조회하려면 폴더를 입력하세요. 상대 경로는 DB 파일 폴더 기준입니다.",
+    ).strip()
+
+    st.sidebar.number_input(
+        "쿼리 제한 시간 (초)",
+        min_value=0,
+        value=DEFAULT_QUERY_TIMEOUT_S,
+        step=30,
+        key=QUERY_TIMEOUT_KEY,
+        help="조회 쿼리가 이 시간을 넘기면 중단합니다. 0이면 제한 없음. 실행 중에는 '⏹ 쿼리 취소' 버튼으로 중단할 수 있습니다.",
+    )
 
     db_path = Path(db_path_input)
     # 상대 경로인 경우 프로젝트 루트 기준으로 변환
@@ -144,7 +200,7 @@ def main() -> None:
             # 일반 Python 실행
             db_path = Path(__file__).parent.parent / db_path
     
-    if not db_path.exists():
+    if not db_path.exists() and not dataset_path:
         # 디버깅 정보 표시
         debug_info = []
         if getattr(sys, 'frozen', False):
@@ -161,14 +217,15 @@ def main() -> None:
                 st.text(info)
         st.stop()
 
-    engine = get_engine(str(db_path))
-    columns = get_table_columns(str(db_path))
+    engine = get_engine(str(db_path), dataset_path)
+    columns = get_table_columns(str(db_path), dataset_path)
     if not columns:
         st.error("general_ledger 테이블 정보를 가져오지 못했습니다.")
         st.stop()
 
-    total_rows = get_total_count(str(db_path))
+    total_rows = get_total_count(str(db_path), dataset_path)
     st.metric("총 행 수", f"{total_rows:,}")
+    render_column_info(str(db_path), dataset_path, columns)
 
     # 조회 모드 선택
     st.sidebar.markdown("---")
@@ -188,6 +245,12 @@ def main() -> None:
     else:  # "💻 SQL 직접입력"
         render_sql_query_tab(engine, columns)
 
+    cache = engine.cache_stats()
+    st.sidebar.caption(
+        f"조회 캐시: 적중 {cache['hits']:,} / 미적중 {cache['misses']:,} "
+        f"(보관 {cache['entries']:,}건, {cache['memory_mb']:.1f}MB)"
+    )
+
 
 # Streamlit은 스크립트를 import할 때 top-level 코드를 실행하므로
 # main()을 항상 top-level에서 호출해야 합니다.
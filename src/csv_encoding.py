@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import codecs
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+import chardet
+
+ENCODING_SAMPLE_BYTES = 256 * 1024  # 판정에 사용할 파일 앞부분 크기
+ENCODING_MAX_SCAN_BYTES = 16 * 1024 * 1024  # 앞부분이 ASCII뿐이면 한글이 나올 때까지 더 읽는 최대 크기
+DEFAULT_ENCODING = "cp949"  # ERP 원본 CSV 기본 인코딩 (판정 불가 시 사용)
+TRANSCODE_BLOCK_CHARS = 4 * 1024 * 1024
+
+# chardet 결과 중 cp949로 읽어야 하는 한국어 인코딩 (cp949가 EUC-KR의 상위 집합)
+_KOREAN_ENCODINGS = {"euc-kr", "cp949", "uhc", "johab", "iso-2022-kr"}
+
+# (파일 경로, 크기, 수정시각) → 판정 결과
+_encoding_cache: dict[tuple[str, int, float], str] = {}
+
+
+def _read_sample(path: Path) -> bytes:
+    """앞부분 ENCODING_SAMPLE_BYTES를 읽고, ASCII뿐이면 비ASCII 바이트가 나올 때까지 더 읽음."""
+    with open(path, "rb") as f:
+        sample = f.read(ENCODING_SAMPLE_BYTES)
+        while sample.isascii() and len(sample) < ENCODING_MAX_SCAN_BYTES:
+            block = f.read(ENCODING_SAMPLE_BYTES)
+            if not block:
+                break
+            sample += block
+    return sample
+
+
+def _decodes(sample: bytes, encoding: str) -> bool:
+    # final=False: 표본 끝에서 잘린 멀티바이트 문자는 오류로 보지 않음
+    try:
+        codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def _judge_encoding(sample: bytes) -> str:
+    """
+    표본 바이트로 인코딩 판정. BOM → UTF-8 검증 → cp949 검증 → chardet 순서.
+    한글이 적은 파일은 chardet이 latin 계열로 오판하는 경우가 있어 cp949 검증을 먼저 합니다.
+    """
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if sample.isascii() or _decodes(sample, "utf-8"):
+        return "utf-8"
+    if _decodes(sample, DEFAULT_ENCODING):
+        return DEFAULT_ENCODING
+
+    detected = (chardet.detect(sample)["encoding"] or "").lower()
+    if not detected or detected in _KOREAN_ENCODINGS or detected.startswith(("utf-8", "ascii")):
+        return DEFAULT_ENCODING
+    return detected
+
+
+def detect_encoding(path: Path | str) -> str:
+    """
+    CSV 파일의 인코딩을 앞부분 표본으로 판정 (utf-8-sig / utf-8 / cp949 / chardet 결과).
+    결과는 (경로, 크기, 수정시각) 기준으로 캐시하여 같은 파일은 다시 읽지 않습니다.
+    """
+    path = Path(path)
+    stat = path.stat()
+    key = (str(path.resolve()), stat.st_size, stat.st_mtime)
+    if key not in _encoding_cache:
+        _encoding_cache[key] = _judge_encoding(_read_sample(path))
+    return _encoding_cache[key]
+
+
+def transcode_to_utf8(path: Path | str, dest: Path | str, encoding: str | None = None) -> Path:
+    """path를 UTF-8로 변환하여 dest에 저장 (블록 단위 스트리밍, 파일 전체를 메모리에 올리지 않음)."""
+    encoding = encoding or detect_encoding(path)
+    dest = Path(dest)
+    with open(path, "r", encoding=encoding, newline="") as src, open(dest, "w", encoding="utf-8", newline="") as out:
+        shutil.copyfileobj(src, out, TRANSCODE_BLOCK_CHARS)
+    return dest
+
+
+@contextmanager
+def utf8_csv(path: Path | str):
+    """
+    UTF-8 입력만 받는 reader(DuckDB read_csv)용 경로를 yield.
+    이미 UTF-8이면 원본 경로를, 아니면 임시 폴더에 같은 파일명으로 변환한 경로를 yield하고 종료 시 삭제.
+    """
+    path = Path(path)
+    if detect_encoding(path) in ("utf-8", "utf-8-sig"):
+        yield path
+        return
+    with tempfile.TemporaryDirectory(prefix="gl_utf8_") as tmp_dir:
+        yield transcode_to_utf8(path, Path(tmp_dir) / path.name)
@@ -1,10 +1,32 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
 from contextlib import contextmanager
+from datetime import datetime
+from functools import partial
 from pathlib import Path
+from typing import Literal
+from urllib.parse import quote, unquote
+import hashlib
+import json
+import math
+import re
+import shutil
 import sys
 import os
+import tempfile
+import threading
+import time
+import uuid
 
 import duckdb
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from csv_encoding import detect_encoding, utf8_csv
+from preprocess_pipeline import DERIVED_TYPES, RAW_FOLDER_PATH, SIGNED_AMOUNT_COLUMN, preprocess_frame, read_raw_csv
+from query_cache import DEFAULT_CACHE_MAX_MB, QueryResultCache, SpilledResult
+from result_export import write_csv_batches
+from trx_hash import HASH_COLUMN
 
 def get_default_db_path() -> Path:
     """
@@ -45,6 +67,10 @@ def get_default_db_path() -> Path:
 # 하위 호환성을 위해 상수로도 제공
 DEFAULT_DB_PATH = Path("data/processed/gl_analyzer.duckdb")
 GL_FOLDER_PATH = Path("data/working/after_processing")  # 전처리된 CSV 파일 위치
+EXPORT_FOLDER_NAME = "exports"  # export_query 결과 파일을 두는 폴더 (DB 파일 폴더 기준)
+EXPORT_BATCH_ROWS = 100_000  # CSV 내보내기 시 한 번에 가져와 쓰는 행 수
+SESSION_RESULT_MAX_MB = 64  # run_query_result가 메모리(Arrow Table)로 반환하는 결과 크기 한도, 넘으면 Parquet 파일로 내림
+SPILL_BATCH_ROWS = 100_000  # 결과를 파일로 내릴 때 한 번에 가져와 쓰는 행 수 (= row group 크기)
 
 # Known column types to override default VARCHAR inference
 KNOWN_TYPES = {
@@ -60,11 +86,157 @@ KNOWN_TYPES = {
     "대변금액기준통화": "DOUBLE",
 }
 
+NUMERIC_TYPES = {"TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT", "FLOAT", "REAL", "DOUBLE", "DECIMAL"}
+NUMERIC_SHADOW_SUFFIX = "_숫자형"  # add_numeric_shadow_column이 만드는 DOUBLE 사본 컬럼 (예: 금액 → 금액_숫자형)
+
+SCHEMA_SAMPLE_ROWS = 10_000  # 타입 추정 시 파일마다 읽는 표본 행 수
+
+# 표본 값 기반 타입 추정용 패턴 (앞자리 0이 있는 코드값은 문자열로 유지)
+_INTEGER_PATTERN = re.compile(r"^-?(?:0|[1-9]\d*)$")
+_DOUBLE_PATTERN = re.compile(r"^-?(?:0|[1-9]\d*)?(?:\.\d+)?(?:[eE][-+]?\d+)?$")
+_DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_NUMERIC_RANK = {"INTEGER": 0, "BIGINT": 1, "DOUBLE": 2}
+
+LINEAGE_COLUMN = "source_file"  # 각 행이 적재된 원본 CSV 파일명 (파일 단위 교체에 사용)
+MANIFEST_TABLE = "ingest_manifest"  # 원본 파일별 적재 이력 (크기, 수정시각, 해시, 행 수)
+
+CsvReader = Literal["duckdb", "pandas", "stream"]
+DEFAULT_MEMORY_BUDGET_MB = 512  # stream reader의 메모리 예산 (pandas 청크와 DuckDB 버퍼가 절반씩 나눠 씀)
+STREAM_MIN_DUCKDB_MB = 32  # stream reader에서 DuckDB memory_limit의 최소값 (이보다 작으면 INSERT가 메모리 부족으로 실패)
+CHECKSUM_COLUMNS = ("차변금액", "대변금액")  # stream 적재 시 원본/DB 합계를 대조할 금액 컬럼
+# duckdb reader에서 NULL로 읽을 문자열 (pandas read_csv 기본 NA 값과 같게 맞춤)
+CSV_NULL_STRINGS = (
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+)
+BALANCE_COLUMNS = ("차변금액", "대변금액")  # numeric_summary에서 둘 다 있으면 차변-대변 차이를 함께 표시
+BALANCE_LABEL = "차변-대변"
+
+DATASET_DIRNAME = "gl_dataset"  # Parquet 데이터셋 기본 폴더명 (DB 파일과 같은 폴더에 생성)
+PARTITION_COLUMNS = ("회계월",)  # Parquet 데이터셋 기본 파티션 컬럼 (필요 시 회사 컬럼을 뒤에 추가)
+PAGE_KEY_COLUMNS = ("전표번호", "전표행번")  # 페이지 조회(keyset) 정렬 기준. 두 컬럼 조합이 행마다 유일해야 함
+CLUSTER_COLUMNS = ("회계월", "전표번호", "전표행번")  # general_ledger 물리 정렬 순서 (cluster_table)
+JE_INDEX_NAME = "idx_general_ledger_je"  # 전표번호 인덱스 (Step2 전표 전체 라인 확장용, 선택)
+
+JE_HEADER_TABLE = "je_header"  # 전표번호별 1행 요약 (라인 수, 차/대변 합계, 차대일치, 계정 목록, 해시, 최초 전기일자)
+JE_HEADER_KEY = "전표번호"
+JE_BALANCE_TOLERANCE = 0.005  # 차변합계와 대변합계 차이가 이 값 미만이면 차대일치
+
+# 적재 후 미리 만들어 두는 집계 큐브 {테이블명: 차원 컬럼}. 집계 탭은 요청을 덮는 가장 작은 큐브에서 다시 집계
+AGG_CUBES = {
+    "agg_cube_month_account": ("회계월", "계정과목코드"),
+    "agg_cube_month_account_dc": ("회계월", "계정과목코드", "차대구분", "전기일자_연도", "전표일자_월"),
+}
+CUBE_MEASURES = ("차변금액", "대변금액", "전표금액", SIGNED_AMOUNT_COLUMN)  # 큐브에 합계/건수/최소/최대를 저장할 숫자 컬럼
+CUBE_CATALOG_TABLE = "agg_cube_catalog"  # 큐브별 차원, 측정값, 행 수
+CUBE_ROWS_COLUMN = "__rows"  # 큐브 그룹별 원본 라인 수
+
+COLUMN_STATS_TABLE = "column_stats"  # 컬럼별 행 수, NULL 수, 근사 고유값 수, 최소/최대, 상위 값 빈도
+COLUMN_STATS_TOP_N = 20  # 컬럼별로 저장할 상위 값 개수
+COLUMN_STATS_UNIQUE_RATIO = 0.5  # 고유값 수가 행 수의 이 비율을 넘는 (거의 고유한) 컬럼은 상위 값 생략
+COLUMN_STATS_MAX_DISTINCT = 5_000  # 고유값 수가 이보다 많은 컬럼도 상위 값 생략 (GROUPING SETS 해시 테이블 크기 제한)
+
+DEFAULT_QUERY_TIMEOUT_S = 300  # 조회 쿼리 기본 제한 시간 (초). 0이면 제한 없음
+QUERY_POLL_INTERVAL_S = 0.2  # 실행 중인 쿼리의 제한 시간/취소 여부를 확인하는 간격
+
+
+class QueryCancelledError(RuntimeError):
+    """조회 쿼리가 취소되어 DuckDB에서 중단됨."""
+
+
+class QueryTimeoutError(QueryCancelledError):
+    """조회 쿼리가 제한 시간을 넘겨 DuckDB에서 중단됨."""
+
+def _sql_literal(value: object) -> str:
+    """문자열을 DuckDB SQL 문자열 리터럴로 변환 (작은따옴표 이스케이프)."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def is_numeric_type(dtype: str) -> bool:
+    """DuckDB 타입명(PRAGMA table_info의 type)이 숫자형인지 여부. DECIMAL(18,2) 같은 정밀도 표기도 허용."""
+    return dtype.upper().split("(")[0] in NUMERIC_TYPES
+
+
+def _sql_value(value: object) -> str:
+    """None은 NULL, 숫자는 그대로, 나머지는 문자열 리터럴로 변환 (keyset 조건용)."""
+    if value is None:
+        return "NULL"
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return repr(value)
+    return _sql_literal(value)
+
+
+def _keyset_condition(key_cols: tuple[str, ...], after: tuple) -> str:
+    """
+    (k1, k2, ...) > after 조건을 OR/AND로 풀어 쓴 SQL. 정렬은 컬럼마다 NULLS LAST 기준이라
+    NULL 키는 값이 있는 키보다 뒤에 오며, after에 NULL이 있어도 IS NULL로 비교합니다.
+    첫 컬럼의 범위 조건(k1 >= a)을 앞에 붙여 DuckDB가 zonemap으로 건너뛸 수 있게 합니다.
+    """
+    condition = ""
+    for col, value in reversed(list(zip(key_cols, after))):
+        column = f'q."{col}"'
+        # NULLS LAST: 값이 있는 키 다음은 더 큰 값 또는 NULL, NULL 키 다음(같은 컬럼 안)은 없음
+        greater = f"({column} > {_sql_value(value)} OR {column} IS NULL)" if value is not None else "FALSE"
+        equal = f"{column} = {_sql_value(value)}" if value is not None else f"{column} IS NULL"
+        condition = greater if not condition else f"{greater} OR ({equal} AND ({condition}))"
+    first = f'q."{key_cols[0]}"'
+    start = f"({first} >= {_sql_value(after[0])} OR {first} IS NULL)" if after[0] is not None else f"{first} IS NULL"
+    return f"{start} AND ({condition})"
+
+
+def _infer_sql_type(values: pd.Series) -> str | None:
+    """
+    문자열 표본 값으로 INTEGER / BIGINT / DOUBLE / DATE / VARCHAR 중 하나를 추정.
+    값이 모두 비어 있으면 None (다른 파일의 추정 결과를 따름).
+    """
+    values = values.dropna().astype(str).str.strip()
+    values = values[values != ""]
+    if values.empty:
+        return None
+
+    if values.map(lambda v: bool(_INTEGER_PATTERN.match(v))).all():
+        max_digits = values.str.lstrip("-").str.len().max()
+        if max_digits <= 9:
+            return "INTEGER"
+        if max_digits <= 18:
+            return "BIGINT"
+        return "VARCHAR"
+    if values.map(lambda v: bool(_DOUBLE_PATTERN.match(v)) and any(c.isdigit() for c in v)).all():
+        return "DOUBLE"
+    if values.map(lambda v: bool(_DATE_PATTERN.match(v))).all():
+        if pd.to_datetime(values, format="%Y-%m-%d", errors="coerce").notna().all():
+            return "DATE"
+    return "VARCHAR"
+
+
+def _widen_sql_type(current: str | None, other: str | None) -> str | None:
+    """두 파일에서 추정한 타입을 모두 담을 수 있는 타입으로 합침."""
+    if current is None or current == other:
+        return other if current is None else current
+    if other is None:
+        return current
+    if current in _NUMERIC_RANK and other in _NUMERIC_RANK:
+        return max(current, other, key=_NUMERIC_RANK.get)
+    return "VARCHAR"
+
+
 class GLEngine:
-    def __init__(self, db_path: Path | str | None = None):
+    def __init__(
+        self,
+        db_path: Path | str | None = None,
+        dataset_path: Path | str | None = None,
+        cache_max_mb: float = DEFAULT_CACHE_MAX_MB,
+        cache_spill_dir: Path | str | None = None,
+        query_timeout_s: float = DEFAULT_QUERY_TIMEOUT_S,
+    ):
         """
         Args:
             db_path: DB 파일 경로. None이면 기본 경로 사용 (PyInstaller 빌드 환경 고려)
+            dataset_path: Hive 파티션 Parquet 데이터셋 폴더. 지정하면 조회 시 general_ledger가
+                데이터셋 위의 view로 연결됨 (상대 경로는 DB 파일 폴더 기준)
+            cache_max_mb: run_query 결과 캐시의 메모리 한도 (MB). 0이면 메모리에 보관하지 않음
+            cache_spill_dir: 지정하면 메모리 한도를 넘은 캐시 결과를 이 폴더에 Parquet으로 보관
+            query_timeout_s: 조회 쿼리 기본 제한 시간 (초). 0이면 제한 없음
         """
         if db_path is None:
             db_path = get_default_db_path()
@@ -117,33 +289,263 @@ class GLEngine:
                 self.db_path = Path(__file__).parent.parent / self.db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
+        self.dataset_path = Path(dataset_path) if dataset_path else None
+        if self.dataset_path is not None and not self.dataset_path.is_absolute():
+            self.dataset_path = self.db_path.parent / self.dataset_path
+
+        # 조회용 읽기 전용 연결 (처음 조회할 때 열고, 스레드마다 cursor를 따로 사용)
+        self._read_conn: duckdb.DuckDBPyConnection | None = None
+        self._read_cursors: dict[int, duckdb.DuckDBPyConnection] = {}
+        self._read_lock = threading.Condition()
+        # 엔진은 여러 Streamlit 세션이 공유하므로, 연결을 닫을 때(쓰기/DB 버전 변경) 실행 중인 조회를 끊지 않고 끝날 때까지 기다림
+        self._active_reads = 0  # 실행 중인 조회 수
+        self._read_blocks = 0  # 조회 연결을 닫는 중이거나 쓰기 연결이 열려 있으면 0보다 크고, 새 조회는 대기
+
+        # run_query 결과 캐시 (DB 버전이 바뀌면 비움)
+        self._cache = QueryResultCache(cache_max_mb, cache_spill_dir)
+        self._cache_version: tuple | None = None
+        self._write_count = 0  # 이 엔진에서 쓰기 연결을 연 횟수 (적재/동기화/내보내기 후 캐시 무효화)
+
+        # 조회 쿼리는 worker 스레드에서 실행하고, 호출한 스레드는 제한 시간/취소를 감시
+        self.query_timeout_s = query_timeout_s
+        self._query_pool = ThreadPoolExecutor(thread_name_prefix="gl-query")
+        # cursor별 JSON 프로파일 출력 위치 (실행 후 스캔 행 수)와 스레드별 마지막 조회 정보
+        self._profile_dir = tempfile.TemporaryDirectory(prefix="gl_profile_")
+        self._last_profile = threading.local()
+        # run_query_result가 크기 한도를 넘은 결과를 내려 두는 폴더 (파일은 SpilledResult 핸들이 사라질 때 삭제)
+        self._result_dir = tempfile.TemporaryDirectory(prefix="gl_results_")
+
+    @contextmanager
+    def _connection(self, use_dataset: bool = False):
+        """
+        Context manager that always closes the DuckDB connection.
+        쓰기용 연결이므로 열기 전에 조회용 읽기 전용 연결을 닫습니다 (같은 파일을 다른 설정으로 동시에 열 수 없음).
+        다른 스레드(세션)에서 실행 중인 조회는 끝날 때까지 기다리고, 쓰기 연결이 열려 있는 동안 새 조회는 대기합니다.
+        use_dataset=True이고 dataset_path가 설정되어 있으면 general_ledger를 Parquet 데이터셋 view로 연결.
+        """
+        with self._read_lock:
+            self._read_blocks += 1
+            self._read_lock.wait_for(lambda: self._active_reads == 0)
+            self._close_reads()
+        try:
+            conn = duckdb.connect(self.db_path)
+            try:
+                if use_dataset and self.dataset_path is not None:
+                    conn.execute(self._dataset_view_sql(self.dataset_path))
+                yield conn
+            finally:
+                conn.close()
+                self._write_count += 1
+        finally:
+            with self._read_lock:
+                self._read_blocks -= 1
+                self._read_lock.notify_all()
+
     @contextmanager
-    def _connection(self):
-        """Context manager that always closes the DuckDB connection."""
-        conn = duckdb.connect(self.db_path)
+    def _reading(self):
+        """
+        조회 하나를 실행하는 동안 현재 스레드의 cursor를 제공.
+        close()나 쓰기 연결이 진행 중이면 끝날 때까지 시작을 기다리고, 실행 중에는 close()가 이 조회를 기다립니다.
+        """
+        with self._read_lock:
+            self._read_lock.wait_for(lambda: self._read_blocks == 0)
+            cursor = self._read_cursor()
+            self._active_reads += 1
         try:
-            yield conn
+            yield cursor
         finally:
-            conn.close()
+            with self._read_lock:
+                self._active_reads -= 1
+                self._read_lock.notify_all()
+
+    def _read_cursor(self) -> duckdb.DuckDBPyConnection:
+        """
+        현재 스레드의 조회용 cursor를 반환.
+        DB는 읽기 전용으로 한 번만 열어 두고(카탈로그와 버퍼 캐시 재사용) 스레드마다 cursor를 만들어 씁니다.
+        cursor는 별도 연결이라 temp view가 공유되지 않으므로 데이터셋 view는 cursor마다 생성.
+        """
+        thread_id = threading.get_ident()
+        with self._read_lock:
+            cursor = self._read_cursors.get(thread_id)
+            if cursor is not None:
+                return cursor
+
+            if self._read_conn is None:
+                # DB 파일 없이 Parquet 데이터셋만 조회하는 경우는 메모리 DB 사용
+                if self.db_path.exists():
+                    self._read_conn = duckdb.connect(self.db_path, read_only=True)
+                else:
+                    self._read_conn = duckdb.connect()
+
+            # 종료된 스레드의 cursor 정리
+            alive = {thread.ident for thread in threading.enumerate()}
+            for ident in [ident for ident in self._read_cursors if ident not in alive]:
+                self._read_cursors.pop(ident).close()
+
+            cursor = self._read_conn.cursor()
+            # 실행 중 진행률(query_progress)과 실행 후 스캔 행 수(JSON 프로파일)를 얻기 위한 설정
+            profile_path = Path(self._profile_dir.name) / f"{thread_id}.json"
+            cursor.execute("SET enable_progress_bar = true")
+            cursor.execute("SET enable_progress_bar_print = false")
+            cursor.execute("SET progress_bar_time = 0")
+            cursor.execute("SET enable_profiling = 'json'")
+            cursor.execute(f"SET profiling_output = {_sql_literal(str(profile_path))}")
+            if self.dataset_path is not None:
+                cursor.execute(self._dataset_view_sql(self.dataset_path))
+            self._read_cursors[thread_id] = cursor
+            return cursor
+
+    def close(self) -> None:
+        """
+        조회용 읽기 전용 연결과 모든 cursor를 닫습니다.
+        다른 프로세스에서 DB를 쓰기 전에 호출하세요. 다음 조회 시 자동으로 다시 열립니다.
+        실행 중인 조회는 중단하지 않고 끝날 때까지 기다립니다.
+        """
+        with self._read_lock:
+            self._read_blocks += 1
+            try:
+                self._read_lock.wait_for(lambda: self._active_reads == 0)
+                self._close_reads()
+            finally:
+                self._read_blocks -= 1
+                self._read_lock.notify_all()
+
+    def _close_reads(self) -> None:
+        """조회용 연결과 cursor 정리 (self._read_lock 안에서, 실행 중인 조회가 없을 때 호출)."""
+        for cursor in self._read_cursors.values():
+            cursor.close()
+        self._read_cursors.clear()
+        if self._read_conn is not None:
+            self._read_conn.close()
+            self._read_conn = None
+
+    def reopen(self) -> None:
+        """조회용 연결을 닫고 다시 열어 최신 DB 내용을 읽도록 합니다 (외부에서 적재한 뒤 사용)."""
+        self.close()
+        self._read_cursor()
+
+    @staticmethod
+    def _dataset_view_sql(dataset_path: Path) -> str:
+        """
+        Hive 파티션 Parquet 데이터셋을 general_ledger temp view로 노출하는 SQL 생성.
+        파티션 키는 폴더명에서 읽으며, DuckDB가 URL 인코딩해 쓴 한글 키는 원래 컬럼명으로 되돌림.
+        회계월 조건은 파티션 폴더 단위로 pruning 됩니다.
+        """
+        sample = next(dataset_path.rglob("*.parquet"), None)
+        if sample is None:
+            raise FileNotFoundError(f"'{dataset_path}' 폴더에 Parquet 파일이 없습니다.")
+
+        keys = [part.split("=", 1)[0] for part in sample.relative_to(dataset_path).parts[:-1] if "=" in part]
+        hive_types = ", ".join(
+            f"{_sql_literal(key)}: {_sql_literal(KNOWN_TYPES.get(unquote(key), 'VARCHAR'))}" for key in keys
+        )
+        renames = ", ".join(f'"{key}" AS "{unquote(key)}"' for key in keys if unquote(key) != key)
+        glob = _sql_literal(dataset_path / "**" / "*.parquet")
+        return f"""
+            CREATE OR REPLACE TEMP VIEW general_ledger AS
+            SELECT *{f" RENAME ({renames})" if renames else ""}
+            FROM read_parquet({glob}, hive_partitioning=true, hive_types={{{hive_types}}}, hive_types_autocast=false)
+        """
+
+    @staticmethod
+    def _profile_csv(csv_path: Path, sample_rows: int, raw: bool = False) -> tuple[list[str], dict[str, str | None]]:
+        """
+        CSV 한 개의 (컬럼 목록, {컬럼: 추정 타입})을 반환. sample_rows=0이면 헤더만 읽음.
+        raw=True면 전처리 전 원본으로 보고 컬럼명 대문자 변환을 적용.
+        """
+        df = pd.read_csv(csv_path, nrows=sample_rows, dtype=str, encoding=detect_encoding(csv_path))
+        if raw:
+            df.columns = [col.upper() for col in df.columns]
+        inferred = {col: _infer_sql_type(df[col]) for col in df.columns} if sample_rows else {}
+        return df.columns.tolist(), inferred
+
+    def discover_schema(
+        self,
+        folder_path: Path | str = GL_FOLDER_PATH,
+        infer_types: bool = False,
+        sample_rows: int = SCHEMA_SAMPLE_ROWS,
+        max_workers: int | None = None,
+        raw: bool = False,
+    ) -> tuple[dict[str, str], pd.DataFrame]:
+        """
+        폴더 내 모든 CSV의 헤더를 병렬로 읽어 합집합 스키마를 생성합니다.
+
+        Args:
+            folder_path: CSV 파일이 있는 폴더
+            infer_types: False(기본)면 KNOWN_TYPES 외 컬럼은 VARCHAR.
+                True면 파일마다 앞쪽 sample_rows 행을 읽어 INTEGER/BIGINT/DOUBLE/DATE 추정
+                (KNOWN_TYPES에 있는 컬럼은 항상 KNOWN_TYPES 우선, 파일 간 타입이 다르면 넓은 타입으로 합침).
+                표본 밖의 값이 추정 타입에 맞지 않으면 해당 파일 적재가 실패하고, 전기일자 같은 컬럼이
+                DATE/INTEGER가 되어 기존 LIKE '2024%' 조건이 달라지므로 데이터를 확인한 경우에만 사용
+            sample_rows: 타입 추정용 표본 행 수
+            max_workers: 헤더 스캔 worker 수. None이면 CPU 코어 수
+            raw: True면 전처리 전 원본 CSV 폴더로 보고, 전처리에서 추가되는 컬럼(DERIVED_TYPES)을 스키마 끝에 붙임.
+                False여도 전처리 후 CSV에 이미 있는 DERIVED_TYPES 컬럼(전표금액_부호추가 등)은 해당 타입으로 읽음
 
-    def collect_schema(self, folder_path: Path | str = GL_FOLDER_PATH) -> dict[str, str]:
-        """폴더 내 첫 번째 CSV 파일을 샘플로 하여 테이블 스키마 생성."""
+        Returns:
+            ({컬럼명: 타입}, 컬럼 × 파일 포함 여부 DataFrame)
+        """
         csv_files = sorted(Path(folder_path).glob("*.csv"))
         if not csv_files:
             raise FileNotFoundError(f"'{folder_path}' 폴더에 CSV 파일이 없습니다.")
 
-        sample_file = csv_files[0]
-        df = pd.read_csv(sample_file, nrows=0)
-        all_columns = set(df.columns.tolist())
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 1) as pool:
+            profiles = list(pool.map(
+                lambda path: self._profile_csv(path, sample_rows if infer_types else 0, raw), csv_files
+            ))
+
+        all_columns = sorted({col for columns, _ in profiles for col in columns})
+        inferred: dict[str, str | None] = {}
+        for _, file_types in profiles:
+            for col, dtype in file_types.items():
+                inferred[col] = _widen_sql_type(inferred.get(col), dtype)
+
+        schema = {
+            col: KNOWN_TYPES.get(col) or DERIVED_TYPES.get(col) or inferred.get(col) or "VARCHAR"
+            for col in all_columns
+        }
+        if raw:
+            schema.update({col: dtype for col, dtype in DERIVED_TYPES.items() if col not in schema})
+        coverage = pd.DataFrame(
+            {path.name: [col in columns for col in all_columns] for path, (columns, _) in zip(csv_files, profiles)},
+            index=all_columns,
+        )
+
+        partial = coverage[~coverage.all(axis=1)]
+        print(f"📋 스키마: {len(csv_files)}개 파일, 컬럼 {len(all_columns)}개 (일부 파일에만 있는 컬럼 {len(partial)}개)")
+        for col, row in partial.iterrows():
+            print(f"   - {col} [{schema[col]}]: {int(row.sum())}/{len(csv_files)}개 파일 (없는 파일: {', '.join(row.index[~row])})")
+        if infer_types:
+            typed = {col: dtype for col, dtype in schema.items() if dtype != "VARCHAR" and col not in KNOWN_TYPES and col not in DERIVED_TYPES}
+            if typed:
+                print(f"🔎 표본으로 추정한 타입: {typed}")
+
+        return schema, coverage
 
-        return {col: KNOWN_TYPES.get(col, "VARCHAR") for col in sorted(all_columns)}
+    def collect_schema(
+        self,
+        folder_path: Path | str = GL_FOLDER_PATH,
+        infer_types: bool = False,
+    ) -> dict[str, str]:
+        """
+        폴더 내 모든 CSV 헤더의 합집합으로 테이블 스키마 생성.
+        infer_types=False(기본)면 KNOWN_TYPES 외 컬럼은 VARCHAR (자세한 옵션은 discover_schema 참고).
+        """
+        schema, _ = self.discover_schema(folder_path, infer_types=infer_types)
+        return schema
     
     def create_table(self, column_types: dict[str, str]) -> None:
+        """general_ledger를 새로 생성 (기존 테이블과 적재 이력은 삭제). source_file 컬럼은 자동 추가."""
         with self._connection() as conn:
             cursor = conn.cursor()
 
             cursor.execute("DROP TABLE IF EXISTS general_ledger")
+            cursor.execute(f"DROP TABLE IF EXISTS {MANIFEST_TABLE}")
+            cursor.execute(f"DROP TABLE IF EXISTS {JE_HEADER_TABLE}")
+            cursor.execute(f"DROP TABLE IF EXISTS {COLUMN_STATS_TABLE}")
+            self._drop_aggregate_cubes(cursor)
 
+            column_types = {**column_types, LINEAGE_COLUMN: column_types.get(LINEAGE_COLUMN, "VARCHAR")}
             cols = ",\n".join(
                 f'"{col}" {dtype}' for col, dtype in column_types.items()
             )
@@ -154,42 +556,614 @@ class GLEngine:
                 );
             """)
 
-    def ingest_csv_files(self, csv_path: Path | str | None = None) -> None:
-        p = Path(csv_path) if csv_path else None
-        if not p or not p.exists():
-            print(f"파일을 찾을 수 없습니다: {p.absolute() if p else csv_path}")
-            return
+    @staticmethod
+    def _je_header_select(table_types: dict[str, str], je_filter: str = "") -> str:
+        """
+        general_ledger 라인을 전표번호별로 요약하는 SELECT (je_header 생성/갱신용).
+        원본에 없는 컬럼의 요약 항목은 생략하며, je_filter는 WHERE에 추가할 조건입니다.
+        """
+        fields = ['COUNT(*) AS "라인수"']
+        if "회계월" in table_types:
+            fields.insert(0, 'MIN("회계월") AS "회계월"')
+        if "차변금액" in table_types:
+            fields.append('SUM("차변금액") AS "차변합계"')
+        if "대변금액" in table_types:
+            fields.append('SUM("대변금액") AS "대변합계"')
+        if "차변금액" in table_types and "대변금액" in table_types:
+            fields.append(
+                'abs(COALESCE(SUM("차변금액"), 0) - COALESCE(SUM("대변금액"), 0)) '
+                f'< {JE_BALANCE_TOLERANCE} AS "차대일치"'
+            )
+        if "계정과목코드" in table_types:
+            fields.append(
+                'string_agg(DISTINCT CAST("계정과목코드" AS VARCHAR), \'|\' '
+                'ORDER BY CAST("계정과목코드" AS VARCHAR)) AS "계정과목목록"'
+            )
+        if HASH_COLUMN in table_types:
+            fields.append(f'MIN("{HASH_COLUMN}") AS "{HASH_COLUMN}"')
+        if "전기일자" in table_types:
+            fields.append('MIN("전기일자") AS "최초전기일자"')
 
+        where = f'"{JE_HEADER_KEY}" IS NOT NULL'
+        if je_filter:
+            where += f" AND {je_filter}"
+        return f"""
+            SELECT "{JE_HEADER_KEY}", {", ".join(fields)}
+            FROM general_ledger
+            WHERE {where}
+            GROUP BY "{JE_HEADER_KEY}"
+        """
+
+    @staticmethod
+    def _has_je_header(cursor) -> bool:
+        cursor.execute(
+            "SELECT COUNT(*) FROM duckdb_tables() WHERE table_name = ? AND NOT temporary", [JE_HEADER_TABLE]
+        )
+        return cursor.fetchone()[0] > 0
+
+    def build_je_header(self) -> int:
+        """
+        je_header를 general_ledger 전체에서 새로 생성하고 전표 수를 반환 (전표번호 순서로 저장).
+        전표 단위 조건(라인 수, 차대일치 등)과 Step2 전표 확장이 라인 전체 대신 이 테이블을 읽습니다.
+        """
         with self._connection() as conn:
-            cursor = conn.cursor()
+            table_types = self._table_types(conn)
+            if JE_HEADER_KEY not in table_types:
+                print(f"⚠️ '{JE_HEADER_KEY}' 컬럼이 없어 {JE_HEADER_TABLE}를 만들지 않습니다.")
+                return 0
+            print(f"🧾 {JE_HEADER_TABLE} 생성 중...")
+            conn.execute(f"""
+                CREATE OR REPLACE TABLE {JE_HEADER_TABLE} AS
+                {self._je_header_select(table_types)}
+                ORDER BY "{JE_HEADER_KEY}"
+            """)
+            conn.execute(f"SELECT COUNT(*) FROM {JE_HEADER_TABLE}")
+            entry_count = conn.fetchone()[0]
+        print(f"✅ {JE_HEADER_TABLE} 생성 완료: 전표 {entry_count:,}건")
+        return entry_count
 
-            try:
-                print(f"🚀 '{p.name}' 검증 및 적재 시작...")
+    def _track_je_header(self, cursor) -> bool:
+        """
+        증분 적재 전에 호출: je_header가 있으면 갱신 대상 전표번호를 모을 temp 테이블(_je_dirty)을 만들고 True 반환.
+        이후 _mark_je_dirty로 바뀌는 파일의 전표번호를 모으고, _refresh_je_header로 해당 전표만 다시 요약합니다.
+        """
+        if not self._has_je_header(cursor):
+            return False
+        cursor.execute(f'CREATE OR REPLACE TEMP TABLE _je_dirty AS SELECT "{JE_HEADER_KEY}" FROM general_ledger LIMIT 0')
+        return True
+
+    @staticmethod
+    def _mark_je_dirty(cursor, source_file: str) -> None:
+        """source_file의 현재 라인에 있는 전표번호를 갱신 대상에 추가 (삭제 전/적재 후에 각각 호출)."""
+        cursor.execute(
+            f'INSERT INTO _je_dirty SELECT DISTINCT "{JE_HEADER_KEY}" FROM general_ledger WHERE "{LINEAGE_COLUMN}" = ?',
+            [source_file],
+        )
+
+    def _refresh_je_header(self, cursor) -> None:
+        """_je_dirty에 모인 전표번호의 je_header 행만 삭제 후 다시 요약 (라인이 모두 사라진 전표는 삭제만 됨)."""
+        dirty = f'SELECT DISTINCT "{JE_HEADER_KEY}" FROM _je_dirty'
+        cursor.execute(f'DELETE FROM {JE_HEADER_TABLE} WHERE "{JE_HEADER_KEY}" IN ({dirty})')
+        cursor.execute(f"""
+            INSERT INTO {JE_HEADER_TABLE} BY NAME
+            {self._je_header_select(self._table_types(cursor), f'"{JE_HEADER_KEY}" IN ({dirty})')}
+        """)
+        print(f"🧾 {JE_HEADER_TABLE} 갱신: 전표 {cursor.fetchone()[0]:,}건")
+        cursor.execute("DROP TABLE _je_dirty")
+
+    @staticmethod
+    def _drop_aggregate_cubes(cursor) -> None:
+        cursor.execute(f"SELECT COUNT(*) FROM duckdb_tables() WHERE table_name = '{CUBE_CATALOG_TABLE}'")
+        if cursor.fetchone()[0]:
+            cursor.execute(f"SELECT cube_name FROM {CUBE_CATALOG_TABLE}")
+            for (cube_name,) in cursor.fetchall():
+                cursor.execute(f'DROP TABLE IF EXISTS "{cube_name}"')
+            cursor.execute(f"DROP TABLE {CUBE_CATALOG_TABLE}")
+
+    def build_aggregate_cubes(
+        self,
+        cubes: dict[str, tuple[str, ...]] | None = None,
+        measures: tuple[str, ...] = CUBE_MEASURES,
+    ) -> dict[str, int]:
+        """
+        general_ledger를 차원별로 미리 집계한 큐브 테이블과 카탈로그(agg_cube_catalog)를 새로 만듭니다.
+        큐브에는 측정값 컬럼마다 합계/건수/최소/최대({컬럼}__sum 등)와 그룹별 라인 수(__rows)를 저장하며,
+        집계 탭은 그룹핑/조건 컬럼이 모두 차원에 있는 요청을 가장 작은 큐브에서 다시 집계합니다.
+
+        Args:
+            cubes: {큐브 테이블명: 차원 컬럼}. None이면 기존 카탈로그 구성, 카탈로그가 없으면 AGG_CUBES
+            measures: 측정값 컬럼 (테이블에 있는 숫자형 컬럼만 사용)
 
-                df = pd.read_csv(p, dtype=str)
-                src_row_count = len(df)
+        Returns:
+            {큐브 테이블명: 행 수}
+        """
+        built: dict[str, int] = {}
+        with self._connection() as conn:
+            table_types = self._table_types(conn)
+            if cubes is None:
+                conn.execute(f"SELECT COUNT(*) FROM duckdb_tables() WHERE table_name = '{CUBE_CATALOG_TABLE}'")
+                if conn.fetchone()[0]:
+                    conn.execute(f"SELECT cube_name, dimensions FROM {CUBE_CATALOG_TABLE} ORDER BY cube_name")
+                    cubes = {name: tuple(dims) for name, dims in conn.fetchall()}
+                cubes = cubes or AGG_CUBES
 
-                cursor.execute("PRAGMA table_info('general_ledger')")
-                table_cols = [row[1] for row in cursor.fetchall()]  # row[1]이 컬럼명
+            measure_cols = [col for col in measures if is_numeric_type(table_types.get(col, ""))]
+            if not measure_cols:
+                print("⚠️ 큐브에 저장할 숫자형 측정값 컬럼이 없어 집계 큐브를 만들지 않습니다.")
+                return built
 
-                df = df.reindex(columns=table_cols, fill_value=pd.NA)
-                df = df.where(pd.notna(df), None)
+            self._drop_aggregate_cubes(conn)
+            conn.execute(f"""
+                CREATE TABLE {CUBE_CATALOG_TABLE} (
+                    cube_name VARCHAR PRIMARY KEY,
+                    dimensions VARCHAR[],
+                    measures VARCHAR[],
+                    row_count BIGINT,
+                    built_at TIMESTAMP
+                )
+            """)
+            for cube_name, dims in cubes.items():
+                dims = [col for col in dims if col in table_types and col not in measure_cols]
+                if not dims:
+                    print(f"⚠️ {cube_name}: 차원 컬럼이 테이블에 없어 건너뜁니다.")
+                    continue
+                dim_list = ", ".join(f'"{col}"' for col in dims)
+                fields = [f'COUNT(*) AS "{CUBE_ROWS_COLUMN}"']
+                for col in measure_cols:
+                    fields += [
+                        f'SUM(CAST("{col}" AS DOUBLE)) AS "{col}__sum"',
+                        f'COUNT("{col}") AS "{col}__count"',
+                        f'MIN(CAST("{col}" AS DOUBLE)) AS "{col}__min"',
+                        f'MAX(CAST("{col}" AS DOUBLE)) AS "{col}__max"',
+                    ]
+                conn.execute(f"""
+                    CREATE TABLE "{cube_name}" AS
+                    SELECT {dim_list}, {", ".join(fields)}
+                    FROM general_ledger
+                    GROUP BY {dim_list}
+                    ORDER BY {dim_list}
+                """)
+                conn.execute(f'SELECT COUNT(*) FROM "{cube_name}"')
+                built[cube_name] = conn.fetchone()[0]
+                conn.execute(
+                    f"INSERT INTO {CUBE_CATALOG_TABLE} VALUES (?, ?, ?, ?, ?)",
+                    [cube_name, dims, measure_cols, built[cube_name], datetime.now()],
+                )
+                print(f"🧊 집계 큐브 {cube_name} ({', '.join(dims)}): {built[cube_name]:,}행")
+        return built
 
-                conn.register("tmp_df", df)
+    def build_column_stats(self, top_n: int = COLUMN_STATS_TOP_N) -> int:
+        """
+        general_ledger 전체 컬럼의 통계 카탈로그(column_stats)를 새로 만듭니다. 만든 컬럼 수를 반환.
+        컬럼마다 행 수, NULL 수, 근사 고유값 수(approx_count_distinct), 최소/최대(문자열로 저장)와
+        상위 top_n개 값의 빈도를 저장하며, 앱의 컬럼 정보/값 목록은 원장을 다시 읽지 않고 이 테이블을 사용합니다.
+        통계는 한 번의 스캔으로, 상위 값은 GROUPING SETS로 한 번에 계산합니다.
+        """
+        with self._connection() as conn:
+            table_types = self._table_types(conn)
+            cols = list(table_types)
+            fields = ["COUNT(*)"]
+            for col in cols:
+                fields += [
+                    f'COUNT("{col}")',
+                    f'approx_count_distinct("{col}")',
+                    f'CAST(MIN("{col}") AS VARCHAR)',
+                    f'CAST(MAX("{col}") AS VARCHAR)',
+                ]
+            conn.execute(f"SELECT {', '.join(fields)} FROM general_ledger")
+            row = conn.fetchone()
+            row_count = row[0]
+            stats = {
+                col: {"non_null": row[1 + 4 * i], "distinct": row[2 + 4 * i], "min": row[3 + 4 * i], "max": row[4 + 4 * i]}
+                for i, col in enumerate(cols)
+            }
 
-                conn.execute("SELECT COUNT(*) FROM general_ledger")
-                before_count = conn.fetchone()[0]
+            # 거의 고유한 컬럼(전표번호+행번 조합, 적요 등)은 상위 값이 모두 1건이라 생략하고,
+            # 고유값이 많은 컬럼은 비율과 상관없이 생략해 GROUPING SETS가 만드는 그룹 수를 제한
+            top_cols = [
+                col for col in cols
+                if stats[col]["distinct"] <= min(row_count * COLUMN_STATS_UNIQUE_RATIO, COLUMN_STATS_MAX_DISTINCT)
+            ]
+            top_values: dict[str, list[dict]] = {col: [] for col in cols}
+            if top_cols and top_n > 0:
+                # GROUPING(col) = 0인 행이 해당 컬럼으로 묶인 그룹
+                col_index = " ".join(f'WHEN GROUPING("{col}") = 0 THEN {i}' for i, col in enumerate(top_cols))
+                col_value = " ".join(
+                    f'WHEN GROUPING("{col}") = 0 THEN CAST("{col}" AS VARCHAR)' for col in top_cols
+                )
+                conn.execute(f"""
+                    SELECT col_index, value, cnt FROM (
+                        SELECT CASE {col_index} END AS col_index, CASE {col_value} END AS value, COUNT(*) AS cnt
+                        FROM general_ledger
+                        GROUP BY GROUPING SETS ({", ".join(f'("{col}")' for col in top_cols)})
+                    )
+                    QUALIFY row_number() OVER (PARTITION BY col_index ORDER BY cnt DESC, value) <= {int(top_n)}
+                    ORDER BY col_index, cnt DESC, value
+                """)
+                for index, value, cnt in conn.fetchall():
+                    top_values[top_cols[index]].append({"value": value, "count": cnt})
 
-                conn.execute("""
-                    INSERT INTO general_ledger
-                    SELECT * FROM tmp_df
+            conn.execute(f"DROP TABLE IF EXISTS {COLUMN_STATS_TABLE}")
+            conn.execute(f"""
+                CREATE TABLE {COLUMN_STATS_TABLE} (
+                    column_name VARCHAR PRIMARY KEY,
+                    column_type VARCHAR,
+                    row_count BIGINT,
+                    null_count BIGINT,
+                    approx_distinct BIGINT,
+                    min_value VARCHAR,
+                    max_value VARCHAR,
+                    top_values STRUCT(value VARCHAR, count BIGINT)[],
+                    built_at TIMESTAMP
+                )
+            """)
+            built_at = datetime.now()
+            conn.executemany(
+                f"INSERT INTO {COLUMN_STATS_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    [
+                        col, table_types[col], row_count, row_count - stats[col]["non_null"], stats[col]["distinct"],
+                        stats[col]["min"], stats[col]["max"], top_values[col], built_at,
+                    ]
+                    for col in cols
+                ],
+            )
+        print(f"📇 {COLUMN_STATS_TABLE} 생성 완료: 컬럼 {len(cols)}개 (상위 값 {len(top_cols)}개 컬럼)")
+        return len(cols)
+
+    def add_numeric_shadow_column(self, column: str) -> str:
+        """
+        VARCHAR로 저장된 숫자 컬럼의 DOUBLE 사본 컬럼({컬럼}_숫자형)을 추가하고 값을 채웁니다.
+        천 단위 쉼표를 제거한 뒤 TRY_CAST로 변환하며, 변환할 수 없는 값은 NULL.
+        집계 탭은 사본 컬럼이 있으면 행마다 TRY_CAST하지 않고 사본을 그대로 집계합니다.
+        이후 ingest_csv_files/sync_folder로 추가되는 행도 자동으로 채워집니다.
+
+        Returns:
+            사본 컬럼명
+        """
+        shadow = f"{column}{NUMERIC_SHADOW_SUFFIX}"
+        with self._connection() as conn:
+            table_types = self._table_types(conn)
+            if column not in table_types:
+                raise ValueError(f"general_ledger에 없는 컬럼입니다: {column}")
+            if is_numeric_type(table_types[column]):
+                raise ValueError(f"'{column}'은(는) 이미 숫자형({table_types[column]})입니다.")
+            if shadow not in table_types:
+                conn.execute(f'ALTER TABLE general_ledger ADD COLUMN "{shadow}" DOUBLE')
+            conn.execute(f"""
+                UPDATE general_ledger SET "{shadow}" = TRY_CAST(REPLACE("{column}", ',', '') AS DOUBLE)
+            """)
+            conn.execute(f'SELECT COUNT("{column}"), COUNT("{shadow}") FROM general_ledger')
+            total, converted = conn.fetchone()
+        print(f"🔢 '{shadow}' 생성: 값 {total:,}개 중 {converted:,}개 숫자 변환 ({total - converted:,}개 NULL)")
+        return shadow
+
+    def _fill_numeric_shadows(self, cursor) -> None:
+        """새로 적재되어 비어 있는 사본 컬럼({컬럼}_숫자형) 값을 원본 컬럼에서 채움."""
+        table_types = self._table_types(cursor)
+        for shadow in table_types:
+            column = shadow.removesuffix(NUMERIC_SHADOW_SUFFIX)
+            if shadow.endswith(NUMERIC_SHADOW_SUFFIX) and column in table_types:
+                cursor.execute(f"""
+                    UPDATE general_ledger SET "{shadow}" = TRY_CAST(REPLACE("{column}", ',', '') AS DOUBLE)
+                    WHERE "{shadow}" IS NULL AND "{column}" IS NOT NULL
                 """)
 
+    def cluster_table(self, create_index: bool | None = None) -> None:
+        """
+        general_ledger를 CLUSTER_COLUMNS(회계월, 전표번호, 전표행번) 순서로 정렬하여 다시 씁니다.
+        같은 전표의 라인이 같은 row group에 모이므로, 일부 전표번호만 찾는 조회(Step2 전표 전체 라인 확장)가
+        zonemap으로 나머지 row group을 건너뛰어 전체 스캔을 하지 않습니다.
+        적재 후 새 행은 테이블 끝에 붙으므로, 증분 적재(sync_folder) 뒤에는 다시 실행하세요.
+
+        Args:
+            create_index: True면 전표번호 인덱스(JE_INDEX_NAME) 생성, False면 삭제, None이면 기존 상태 유지
+        """
+        with self._connection() as conn:
+            table_types = self._table_types(conn)
+            order_by = ", ".join(f'"{col}"' for col in CLUSTER_COLUMNS if col in table_types)
+            if not order_by:
+                raise ValueError(f"general_ledger에 정렬 기준 컬럼({', '.join(CLUSTER_COLUMNS)})이 없습니다.")
+
+            conn.execute(
+                "SELECT COUNT(*) FROM duckdb_indexes() WHERE table_name = 'general_ledger' AND index_name = ?",
+                [JE_INDEX_NAME],
+            )
+            build_index = conn.fetchone()[0] > 0 if create_index is None else create_index
+            build_index = build_index and "전표번호" in table_types
+
+            print(f"🧱 general_ledger 재정렬 중... (ORDER BY {order_by})")
+            start = time.perf_counter()
+            conn.begin()
+            try:
+                # 정렬된 새 테이블로 교체 (기존 인덱스는 테이블과 함께 삭제됨)
+                conn.execute(f"CREATE TABLE general_ledger_clustered AS SELECT * FROM general_ledger ORDER BY {order_by}")
+                conn.execute("DROP TABLE general_ledger")
+                conn.execute("ALTER TABLE general_ledger_clustered RENAME TO general_ledger")
                 conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            if build_index:
+                print("🔎 전표번호 인덱스 생성 중...")
+                conn.execute(f'CREATE INDEX {JE_INDEX_NAME} ON general_ledger ("전표번호")')
+            conn.execute("CHECKPOINT")
+            print(
+                f"✅ 재정렬 완료: {time.perf_counter() - start:.1f}초 "
+                f"(전표번호 인덱스: {'생성' if build_index else '없음'})"
+            )
+
+    @staticmethod
+    def _table_types(cursor) -> dict[str, str]:
+        """general_ledger 테이블의 {컬럼명: 타입}을 테이블 정의 순서대로 반환."""
+        cursor.execute("PRAGMA table_info('general_ledger')")
+        return {row[1]: row[2] for row in cursor.fetchall()}  # row[1]이 컬럼명, row[2]가 타입
+
+    @staticmethod
+    def _csv_columns(cursor, csv_path: Path) -> list[str]:
+        """DuckDB reader로 CSV 헤더만 읽어 컬럼명 목록을 반환."""
+        cursor.execute(
+            f"SELECT * FROM read_csv({_sql_literal(csv_path)}, header=true, all_varchar=true) LIMIT 0"
+        )
+        return [desc[0] for desc in cursor.description]
+
+    @staticmethod
+    def _csv_row_count(cursor, csv_path: Path) -> int:
+        """
+        적재 결과와 대조할 원본 CSV 행 수 (타입 변환 없이 VARCHAR로만 읽어 셈).
+        CSV를 한 번 더 파싱하므로 verify=True로 적재할 때만 사용합니다.
+        """
+        cursor.execute(f"SELECT COUNT(*) FROM read_csv({_sql_literal(csv_path)}, header=true, all_varchar=true)")
+        return cursor.fetchone()[0]
+
+    @staticmethod
+    def _mapped_csv_select(csv_path: Path, csv_cols: list[str], table_types: dict[str, str]) -> str:
+        """
+        CSV를 general_ledger 컬럼 순서로 매핑하는 SELECT 문 생성.
+        - 테이블에 있는 컬럼은 테이블 타입으로 읽고, 나머지는 VARCHAR로 읽음
+        - CSV에 없는 컬럼은 NULL로 채움 (pandas 경로의 reindex와 동일)
+        - CSV_NULL_STRINGS("NA", "NULL", 빈 문자열 등)는 pandas 경로처럼 NULL로 읽음
+        """
+        types = ", ".join(
+            f"{_sql_literal(col)}: {_sql_literal(table_types[col])}"
+            for col in csv_cols
+            if col in table_types and table_types[col] != "VARCHAR"
+        )
+        types_arg = f", types={{{types}}}" if types else ""
+        nullstr = ", ".join(_sql_literal(value) for value in CSV_NULL_STRINGS)
+
+        present = set(csv_cols)
+        select_cols = ", ".join(
+            f'"{col}"' if col in present
+            else f'{_sql_literal(csv_path.name)} AS "{col}"' if col == LINEAGE_COLUMN
+            else f'CAST(NULL AS {dtype}) AS "{col}"'
+            for col, dtype in table_types.items()
+        )
+        return f"""
+            SELECT {select_cols}
+            FROM read_csv({_sql_literal(csv_path)}, header=true, all_varchar=true, nullstr=[{nullstr}]{types_arg})
+        """
+
+    @staticmethod
+    def _stream_chunk_rows(csv_path: Path, memory_budget_mb: int) -> int:
+        """앞부분 1,000행의 실제 DataFrame 크기로 행당 메모리를 추정하여 예산에 맞는 청크 행 수를 계산."""
+        sample = pd.read_csv(csv_path, dtype=str, nrows=1000, encoding=detect_encoding(csv_path))
+        if sample.empty:
+            return 1000
+        # reindex / where 과정에서 청크가 한 번 더 복사되므로 2배로 잡음
+        bytes_per_row = 2 * sample.memory_usage(deep=True).sum() / len(sample)
+        return max(1000, int(memory_budget_mb * 1024 * 1024 / bytes_per_row))
+
+    def _stage_csv_stream(
+        self, cursor, csv_path: Path, stage_table: str, table_types: dict[str, str], memory_budget_mb: int
+    ) -> int:
+        """
+        CSV를 메모리 예산 크기의 청크로 나누어 staging 테이블에 적재하고 원본 CSV 행 수를 반환.
+        청크마다 행 수와 금액 컬럼 합계를 누적하여, 적재 후 staging 테이블 합계와 대조합니다.
+        청크는 각각 자동 커밋됨 (하나의 트랜잭션에 쌓으면 커밋 전까지 메모리에 남기 때문).
+        예산은 pandas 청크와 DuckDB 버퍼(memory_limit, 초과분은 디스크로 내보냄)가 절반씩 나눠 쓰며,
+        DuckDB 쪽은 STREAM_MIN_DUCKDB_MB 이상으로 잡고 적재 후 원래 memory_limit으로 되돌립니다.
+        """
+        duckdb_mb = max(STREAM_MIN_DUCKDB_MB, memory_budget_mb // 2)
+        chunk_mb = max(1, memory_budget_mb - memory_budget_mb // 2)
+        if duckdb_mb + chunk_mb > memory_budget_mb:
+            print(f"ℹ️ 메모리 예산 {memory_budget_mb}MB가 작아 DuckDB 버퍼는 최소 {STREAM_MIN_DUCKDB_MB}MB로 설정합니다.")
+        cursor.execute("SELECT current_setting('memory_limit')")
+        previous_limit = cursor.fetchone()[0]
+        cursor.execute(f"SET memory_limit = '{duckdb_mb}MB'")
+        try:
+            return self._stream_chunks_to_stage(cursor, csv_path, stage_table, table_types, chunk_mb)
+        finally:
+            # current_setting 값은 반올림된 문자열이라, 기본값이었으면 RESET으로 정확히 되돌림
+            cursor.execute("RESET memory_limit")
+            cursor.execute("SELECT current_setting('memory_limit')")
+            if cursor.fetchone()[0] != previous_limit:
+                cursor.execute(f"SET memory_limit = {_sql_literal(previous_limit)}")
+
+    def _stream_chunks_to_stage(
+        self, cursor, csv_path: Path, stage_table: str, table_types: dict[str, str], chunk_mb: int
+    ) -> int:
+        """_stage_csv_stream 본체: chunk_mb 크기의 청크로 읽어 staging 테이블에 넣고 금액 합계를 대조."""
+        cursor.execute(f'CREATE OR REPLACE TABLE "{stage_table}" AS SELECT * FROM general_ledger LIMIT 0')
+
+        checksum_cols = [col for col in CHECKSUM_COLUMNS if col in table_types]
+        chunk_rows = self._stream_chunk_rows(csv_path, chunk_mb)
+        src_row_count = 0
+        src_totals = [0.0] * len(checksum_cols)
+        for chunk in pd.read_csv(csv_path, dtype=str, chunksize=chunk_rows, encoding=detect_encoding(csv_path)):
+            src_row_count += len(chunk)
+            for i, col in enumerate(checksum_cols):
+                if col in chunk.columns:
+                    src_totals[i] += pd.to_numeric(chunk[col], errors="coerce").sum()
+
+            if LINEAGE_COLUMN in table_types and LINEAGE_COLUMN not in chunk.columns:
+                chunk[LINEAGE_COLUMN] = csv_path.name
+            chunk = chunk.reindex(columns=list(table_types), fill_value=pd.NA)
+            chunk = chunk.where(pd.notna(chunk), None)
+
+            cursor.register("tmp_chunk", chunk)
+            try:
+                cursor.execute(f'INSERT INTO "{stage_table}" SELECT * FROM tmp_chunk')
+            finally:
+                cursor.unregister("tmp_chunk")
+            del chunk
+            print(f"   ↳ {src_row_count:,}행 읽음 (청크 {chunk_rows:,}행)")
+
+        if checksum_cols:
+            sum_sql = ", ".join(f'COALESCE(SUM("{col}"), 0)' for col in checksum_cols)
+            cursor.execute(f'SELECT {sum_sql} FROM "{stage_table}"')
+            for col, src_total, db_total in zip(checksum_cols, src_totals, cursor.fetchone()):
+                if not math.isclose(src_total, db_total, rel_tol=1e-9, abs_tol=1e-6):
+                    raise ValueError(f"'{col}' 합계 불일치: 원본 CSV {src_total:,.2f} / DB {db_total:,.2f}")
+                print(f"🧮 '{col}' 합계 대조 일치: {src_total:,.2f}")
+
+        return src_row_count
+
+    @contextmanager
+    def _csv_source(
+        self,
+        cursor,
+        csv_path: Path,
+        reader: CsvReader,
+        memory_budget_mb: int = DEFAULT_MEMORY_BUDGET_MB,
+        verify: bool = False,
+    ):
+        """
+        CSV를 general_ledger 컬럼 순서의 SELECT 문으로 준비합니다 (적재 트랜잭션 시작 전에 호출).
+        (SELECT 문, 원본 CSV 행 수)를 yield합니다. duckdb reader는 INSERT가 읽은 행 수를 쓰도록 None을 넘기며,
+        verify=True면 원본 행 수를 적재 SELECT와 따로 세어(_csv_row_count) 적재 행 수와 대조할 수 있도록 함.
+        duckdb reader는 UTF-8만 읽으므로 다른 인코딩은 임시 UTF-8 파일로 변환하여 읽습니다.
+        """
+        table_types = self._table_types(cursor)
+
+        if reader == "duckdb":
+            with utf8_csv(csv_path) as utf8_path:
+                csv_cols = self._csv_columns(cursor, utf8_path)
+                src_row_count = self._csv_row_count(cursor, utf8_path) if verify else None
+                yield self._mapped_csv_select(utf8_path, csv_cols, table_types), src_row_count
+        elif reader == "pandas":
+            df = pd.read_csv(csv_path, dtype=str, encoding=detect_encoding(csv_path))
+            src_row_count = len(df)
+
+            if LINEAGE_COLUMN in table_types and LINEAGE_COLUMN not in df.columns:
+                df[LINEAGE_COLUMN] = csv_path.name
+            df = df.reindex(columns=list(table_types), fill_value=pd.NA)
+            df = df.where(pd.notna(df), None)
+
+            cursor.register("tmp_df", df)
+            try:
+                yield "SELECT * FROM tmp_df", src_row_count
+            finally:
+                cursor.unregister("tmp_df")
+        elif reader == "stream":
+            stage_table = "_stage_gl_stream"
+            try:
+                src_row_count = self._stage_csv_stream(cursor, csv_path, stage_table, table_types, memory_budget_mb)
+                yield f'SELECT * FROM "{stage_table}"', src_row_count
+            finally:
+                cursor.execute(f'DROP TABLE IF EXISTS "{stage_table}"')
+        else:
+            raise ValueError(f"지원하지 않는 reader입니다: {reader}")
+
+    @staticmethod
+    def _insert_csv(cursor, source_sql: str, src_row_count: int | None) -> tuple[int, int]:
+        """
+        _csv_source로 준비한 SELECT 결과를 general_ledger에 INSERT하고 (원본 CSV 행 수, DB 적재 행 수)를 반환.
+        src_row_count가 None이면 INSERT가 읽은 행 수를 원본 행 수로 사용.
+        호출하는 쪽의 트랜잭션 안에서 실행되도록 전달받은 cursor를 그대로 사용하며, 커밋은 호출하는 쪽에서 처리.
+        """
+        cursor.execute("SELECT COUNT(*) FROM general_ledger")
+        before_count = cursor.fetchone()[0]
+
+        cursor.execute(f"""
+            INSERT INTO general_ledger
+            {source_sql}
+        """)
+        produced_rows = cursor.fetchone()[0]  # INSERT는 SELECT가 만든 행 수를 반환
+        if src_row_count is None:
+            src_row_count = produced_rows
+
+        cursor.execute("SELECT COUNT(*) FROM general_ledger")
+        after_count = cursor.fetchone()[0]
+        return src_row_count, after_count - before_count
+
+    @staticmethod
+    def _file_fingerprint(path: Path) -> tuple[int, float, str]:
+        """파일의 (크기, 수정시각, md5 해시)를 반환. 해시는 블록 단위로 읽어 계산."""
+        stat = path.stat()
+        digest = hashlib.md5()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(8 * 1024 * 1024), b""):
+                digest.update(block)
+        return stat.st_size, stat.st_mtime, digest.hexdigest()
+
+    @staticmethod
+    def _ensure_manifest(cursor) -> None:
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {MANIFEST_TABLE} (
+                source_file VARCHAR PRIMARY KEY,
+                source_path VARCHAR,
+                file_size BIGINT,
+                mtime DOUBLE,
+                content_hash VARCHAR,
+                row_count BIGINT,
+                ingested_at TIMESTAMP
+            )
+        """)
+
+    @staticmethod
+    def _record_manifest(cursor, path: Path, fingerprint: tuple[int, float, str], row_count: int) -> None:
+        size, mtime, content_hash = fingerprint
+        cursor.execute(
+            f"INSERT OR REPLACE INTO {MANIFEST_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [path.name, str(path.resolve()), size, mtime, content_hash, row_count, datetime.now()],
+        )
+
+    def ingest_csv_files(
+        self,
+        csv_path: Path | str | None = None,
+        reader: CsvReader = "duckdb",
+        memory_budget_mb: int = DEFAULT_MEMORY_BUDGET_MB,
+        rebuild_summaries: bool = True,
+        verify: bool = False,
+    ) -> None:
+        """
+        CSV 파일 한 개를 general_ledger에 적재.
+
+        Args:
+            csv_path: 적재할 CSV 파일 경로
+            reader: "duckdb"는 DuckDB read_csv로 직접 적재 (테이블 타입으로 파싱, 컬럼명 기준 매핑),
+                "pandas"는 기존 방식 (전체를 문자열 DataFrame으로 읽은 뒤 적재),
+                "stream"은 메모리 예산 크기의 청크 단위로 읽어 적재 (대용량 파일용, 금액 합계 대조 포함)
+            memory_budget_mb: stream reader의 메모리 예산 (MB)
+            rebuild_summaries: True면 적재 후 집계 큐브(같은 구성)와 column_stats를 다시 만듦 (이전 합계/통계로 조회되지 않도록).
+                여러 파일을 이어서 적재할 때는 False로 두고 마지막에 한 번 build_aggregate_cubes() / build_column_stats() 호출
+            verify: True면 duckdb reader의 원본 CSV 행 수를 적재와 따로 다시 세어 대조 (CSV를 한 번 더 읽음)
+        """
+        p = Path(csv_path) if csv_path else None
+        if not p or not p.exists():
+            print(f"파일을 찾을 수 없습니다: {p.absolute() if p else csv_path}")
+            return
+
+        with self._connection() as conn:
+            try:
+                print(f"🚀 '{p.name}' 검증 및 적재 시작... (reader: {reader})")
 
-                conn.execute("SELECT COUNT(*) FROM general_ledger")
-                after_count = conn.fetchone()[0]
-                inserted_rows = after_count - before_count
+                fingerprint = self._file_fingerprint(p)
+                self._ensure_manifest(conn)
+                with self._csv_source(conn, p, reader, memory_budget_mb, verify) as (source_sql, src_row_count):
+                    conn.begin()
+                    try:
+                        src_row_count, inserted_rows = self._insert_csv(conn, source_sql, src_row_count)
+                        self._record_manifest(conn, p, fingerprint, inserted_rows)
+                        self._fill_numeric_shadows(conn)
+                        if self._track_je_header(conn):
+                            self._mark_je_dirty(conn, p.name)
+                            self._refresh_je_header(conn)
+                        conn.commit()
+                    except Exception:
+                        conn.rollback()
+                        raise
 
                 print(f"\n--- 📊 적재 리포트 ---")
                 print(f"📄 원본 CSV 행 수: {src_row_count:,}")
@@ -199,16 +1173,143 @@ class GLEngine:
             except Exception as e:
                 print(f"❌ 적재 중 치명적 오류: {e}")
                 raise
+
+        if rebuild_summaries:
+            self.build_aggregate_cubes()
+            self.build_column_stats()
+
+    def _stage_csv(
+        self, conn, csv_path: Path, stage_table: str, table_types: dict[str, str], verify: bool = False
+    ) -> tuple[int, tuple[int, float, str]]:
+        """
+        CSV를 general_ledger 컬럼 구성의 staging 테이블로 적재 (worker 스레드용).
+        (원본 CSV 행 수, 파일 fingerprint)를 반환. 원본 행 수는 staging 행 수이며,
+        verify=True면 staging과 따로 세어 병합 후 적재 행 수와 대조.
+        """
+        cursor = conn.cursor()
+        try:
+            fingerprint = self._file_fingerprint(csv_path)
+            with utf8_csv(csv_path) as utf8_path:
+                csv_cols = self._csv_columns(cursor, utf8_path)
+                cursor.execute(f"""
+                    CREATE OR REPLACE TABLE "{stage_table}" AS
+                    {self._mapped_csv_select(utf8_path, csv_cols, table_types)}
+                """)
+                staged_rows = cursor.fetchone()[0]  # CREATE TABLE AS는 생성된 행 수를 반환
+                src_row_count = self._csv_row_count(cursor, utf8_path) if verify else staged_rows
+            return src_row_count, fingerprint
+        finally:
+            cursor.close()
+
+    def _stage_raw_csv(
+        self, conn, csv_path: Path, stage_table: str, table_types: dict[str, str]
+    ) -> tuple[int, tuple[int, float, str]]:
+        """
+        원본 CSV를 읽어 노트북 전처리(preprocess_frame)를 적용한 뒤 staging 테이블로 적재 (worker 스레드용).
+        중간 CSV를 쓰지 않고 DataFrame을 그대로 DuckDB에 넘기며, 테이블 타입으로의 변환도 worker에서 처리.
+        (staging 행 수, 파일 fingerprint)를 반환.
+        """
+        cursor = conn.cursor()
+        try:
+            fingerprint = self._file_fingerprint(csv_path)
+            all_columns = [col for col in table_types if col not in DERIVED_TYPES and col != LINEAGE_COLUMN]
+            df = preprocess_frame(read_raw_csv(csv_path), all_columns, list(KNOWN_TYPES))
+
+            df[LINEAGE_COLUMN] = csv_path.name
+            df = df.reindex(columns=list(table_types))
+            text_cols = df.columns[df.dtypes == object]
+            df[text_cols] = df[text_cols].where(pd.notna(df[text_cols]), None)
+
+            select_cols = ", ".join(f'CAST("{col}" AS {dtype}) AS "{col}"' for col, dtype in table_types.items())
+            cursor.register("tmp_raw_df", df)
+            try:
+                cursor.execute(f'CREATE OR REPLACE TABLE "{stage_table}" AS SELECT {select_cols} FROM tmp_raw_df')
+                return cursor.fetchone()[0], fingerprint
             finally:
+                cursor.unregister("tmp_raw_df")
+        finally:
+            cursor.close()
+
+    def _ingest_parallel(self, csv_files: list[Path], max_workers: int | None, stage=None) -> int:
+        """
+        여러 CSV를 worker 스레드에서 동시에 staging 테이블로 파싱한 뒤,
+        하나의 트랜잭션으로 general_ledger에 병합합니다. 성공한 파일 수를 반환.
+        stage는 파일 한 개를 staging 테이블로 만드는 함수 (기본: _stage_csv, 원본 CSV는 _stage_raw_csv).
+        """
+        stage = stage or self._stage_csv
+        max_workers = max_workers or os.cpu_count() or 1
+        stage_tables = {path: f"_stage_gl_{i}" for i, path in enumerate(csv_files)}
+
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            try:
+                table_types = self._table_types(cursor)
+
+                print(f"⚙️ {len(csv_files)}개 파일 병렬 파싱 중... (workers: {max_workers})")
+                staged: dict[Path, int] = {}
+                fingerprints: dict[Path, tuple[int, float, str]] = {}
+                with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                    futures = {
+                        pool.submit(stage, conn, path, stage_tables[path], table_types): path
+                        for path in csv_files
+                    }
+                    for future in as_completed(futures):
+                        path = futures[future]
+                        try:
+                            staged[path], fingerprints[path] = future.result()
+                        except Exception as e:
+                            print(f"⚠️ 파일 적재 실패({path.name}): {e}")
+
+                print(f"🔗 {len(staged)}개 파일 병합 중 (단일 트랜잭션)...")
+                inserted: dict[Path, int] = {}
+                self._ensure_manifest(cursor)
+                cursor.execute("BEGIN TRANSACTION")
                 try:
-                    conn.unregister("tmp_df")
+                    for path in csv_files:  # 파일명 순서대로 병합
+                        if path in staged:
+                            cursor.execute(f'INSERT INTO general_ledger SELECT * FROM "{stage_tables[path]}"')
+                            inserted[path] = cursor.fetchone()[0]
+                            self._record_manifest(cursor, path, fingerprints[path], inserted[path])
+                    self._fill_numeric_shadows(cursor)
+                    cursor.execute("COMMIT")
                 except Exception:
-                    pass
+                    cursor.execute("ROLLBACK")
+                    raise
 
+                print("\n--- 📊 적재 리포트 ---")
+                for path in csv_files:
+                    if path in staged:
+                        print(f"📄 {path.name}: 원본 CSV 행 수 {staged[path]:,} / DB 적재 행 수 {inserted[path]:,}")
+                print(f"📥 DB 적재 행 수 합계: {sum(inserted.values()):,}")
+                return len(staged)
+            finally:
+                for stage_table in stage_tables.values():
+                    cursor.execute(f'DROP TABLE IF EXISTS "{stage_table}"')
                 cursor.close()
 
-    def ingest_all_raw_data(self, folder_path: Path | str = GL_FOLDER_PATH) -> None:
-        """폴더 내의 모든 CSV 파일을 순차적으로 적재합니다."""
+    def ingest_all_raw_data(
+        self,
+        folder_path: Path | str = GL_FOLDER_PATH,
+        reader: CsvReader = "duckdb",
+        parallel: bool = False,
+        max_workers: int | None = None,
+        memory_budget_mb: int = DEFAULT_MEMORY_BUDGET_MB,
+        cluster: bool = False,
+        verify: bool = False,
+    ) -> None:
+        """
+        폴더 내의 모든 CSV 파일을 적재합니다.
+
+        Args:
+            folder_path: CSV 파일이 있는 폴더
+            reader: 순차 적재 시 사용할 reader (ingest_csv_files 참고)
+            parallel: True면 파일들을 동시에 파싱(staging)한 뒤 한 번에 병합 (DuckDB reader 사용)
+            max_workers: 병렬 적재 worker 수. None이면 CPU 코어 수
+            memory_budget_mb: stream reader의 메모리 예산 (MB)
+            cluster: True면 적재 후 cluster_table로 회계월/전표번호 순서로 재정렬
+            verify: True면 원본 CSV 행 수를 적재와 따로 다시 세어 대조 (ingest_csv_files 참고)
+        적재 후 전표 요약 테이블(je_header)과 집계 큐브를 새로 만듭니다.
+        """
         p = Path(folder_path)
         if not p.is_dir():
             print(f"파일을 찾을 수 없습니다: {folder_path}")
@@ -222,26 +1323,606 @@ class GLEngine:
 
         print(f"총 {total_files}개의 파일을 발견했습니다.")
 
-        success_count = 0
-        for i, file_path in enumerate(csv_files):
-            print(f"\n[{i+1}/{total_files}] 작업중...: {file_path.name}")
-            try:
-                # 기존의 정밀 적재 메서드 호출
-                self.ingest_csv_files(file_path)
-                success_count += 1
-            except Exception as e:
-                print(f"⚠️ 파일 적재 실패({file_path.name}): {e}")
+        if parallel:
+            success_count = self._ingest_parallel(csv_files, max_workers, partial(self._stage_csv, verify=verify))
+        else:
+            success_count = 0
+            for i, file_path in enumerate(csv_files):
+                print(f"\n[{i+1}/{total_files}] 작업중...: {file_path.name}")
+                try:
+                    # 기존의 정밀 적재 메서드 호출
+                    self.ingest_csv_files(
+                        file_path, reader=reader, memory_budget_mb=memory_budget_mb, rebuild_summaries=False,
+                        verify=verify,
+                    )
+                    success_count += 1
+                except Exception as e:
+                    print(f"⚠️ 파일 적재 실패({file_path.name}): {e}")
 
         print(f"\n✅ 전체 공정 완료: {success_count}/{total_files} 파일 적재 성공")
+        if cluster and success_count:
+            self.cluster_table()
+        if success_count:
+            self.build_je_header()
+            self.build_aggregate_cubes()
+            self.build_column_stats()
             
-    def run_query(self, query: str) -> pd.DataFrame:
-        """UI에서 요청한 쿼리 실행 결과를 Pandas DataFrame으로 반환"""
+    def ingest_raw_folder(
+        self,
+        folder_path: Path | str = RAW_FOLDER_PATH,
+        max_workers: int | None = None,
+        cluster: bool = False,
+    ) -> None:
+        """
+        전처리 전 원본 CSV 폴더(before_processing)로 general_ledger를 새로 구축합니다.
+        노트북 전처리(대문자 컬럼, 컬럼 통일, 숫자 변환, 거래유형 해시, 부호 금액, 연도/월)를
+        파일마다 worker 스레드에서 적용해 바로 적재하므로, after_processing CSV를 쓰고 다시 읽지 않습니다.
+
+        Args:
+            folder_path: 원본 CSV 폴더
+            max_workers: 전처리/적재 worker 수. None이면 CPU 코어 수
+            cluster: True면 적재 후 cluster_table로 회계월/전표번호 순서로 재정렬
+        적재 후 전표 요약 테이블(je_header)과 집계 큐브를 새로 만듭니다.
+        """
+        p = Path(folder_path)
+        csv_files = sorted(p.glob("*.csv")) if p.is_dir() else []
+        if not csv_files:
+            print(f"적재할 원본 CSV 파일이 없습니다: {folder_path}")
+            return
+
+        print(f"총 {len(csv_files)}개의 원본 파일을 발견했습니다.")
+        schema, _ = self.discover_schema(p, max_workers=max_workers, raw=True)
+        self.create_table(schema)
+
+        success_count = self._ingest_parallel(csv_files, max_workers, stage=self._stage_raw_csv)
+        print(f"\n✅ 전처리 + 적재 완료: {success_count}/{len(csv_files)} 파일 적재 성공")
+        if cluster and success_count:
+            self.cluster_table()
+        if success_count:
+            self.build_je_header()
+            self.build_aggregate_cubes()
+            self.build_column_stats()
+
+    def sync_folder(
+        self,
+        folder_path: Path | str = GL_FOLDER_PATH,
+        reader: CsvReader = "duckdb",
+        prune_missing: bool = False,
+        memory_budget_mb: int = DEFAULT_MEMORY_BUDGET_MB,
+        cluster: bool = False,
+        verify: bool = False,
+    ) -> dict[str, list[str]]:
+        """
+        폴더의 CSV와 DB를 파일 단위로 동기화합니다 (증분 적재).
+        - 크기/수정시각이 적재 이력과 같거나 내용 해시가 같은 파일은 건너뜀
+        - 내용이 바뀐 파일은 해당 source_file의 행을 삭제한 뒤 다시 적재 (파일별 단일 트랜잭션)
+        - 새 파일은 적재. prune_missing=True면 폴더에서 사라진 파일의 행도 삭제
+        - je_header가 있으면 바뀐 파일에 속한 전표만 다시 요약
+        general_ledger가 없으면 collect_schema로 생성하고, 적재 후 je_header도 만듭니다.
+        변경된 파일이 있으면 집계 큐브를 다시 만듭니다.
+        cluster=True면 변경된 파일이 있을 때 cluster_table로 다시 정렬합니다 (기존 인덱스 유지).
+        verify=True면 원본 CSV 행 수를 적재와 따로 다시 세어 대조합니다 (ingest_csv_files 참고).
+
+        Returns:
+            {"unchanged": [...], "replaced": [...], "added": [...], "removed": [...], "failed": [...]} 파일명 목록
+        """
+        result: dict[str, list[str]] = {
+            "unchanged": [], "replaced": [], "added": [], "removed": [], "failed": [],
+        }
+        p = Path(folder_path)
+        if not p.is_dir():
+            print(f"파일을 찾을 수 없습니다: {folder_path}")
+            return result
+        csv_files = sorted(p.glob("*.csv"))
+
         with self._connection() as conn:
-            cursor = conn.cursor()
-            df = cursor.execute(query).df()
-            cursor.close()
+            conn.execute("SELECT COUNT(*) FROM duckdb_tables() WHERE table_name = 'general_ledger'")
+            has_table = conn.fetchone()[0] > 0
+        if not has_table:
+            self.create_table(self.collect_schema(p))
+
+        with self._connection() as conn:
+            if LINEAGE_COLUMN not in self._table_types(conn):
+                raise ValueError(
+                    f"general_ledger에 '{LINEAGE_COLUMN}' 컬럼이 없습니다. create_table로 재구축한 뒤 다시 실행하세요."
+                )
+            self._ensure_manifest(conn)
+            conn.execute(f"SELECT source_file, file_size, mtime, content_hash FROM {MANIFEST_TABLE}")
+            manifest = {row[0]: row[1:] for row in conn.fetchall()}
+            track_header = self._track_je_header(conn)
+
+            print(f"총 {len(csv_files)}개의 파일을 적재 이력과 비교합니다.")
+            for path in csv_files:
+                stat = path.stat()
+                entry = manifest.get(path.name)
+                if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime:
+                    result["unchanged"].append(path.name)
+                    continue
+
+                fingerprint = self._file_fingerprint(path)
+                if entry and entry[2] == fingerprint[2]:
+                    # 내용은 같고 수정시각만 바뀐 경우: 이력만 갱신
+                    conn.execute(
+                        f"UPDATE {MANIFEST_TABLE} SET file_size = ?, mtime = ? WHERE source_file = ?",
+                        [fingerprint[0], fingerprint[1], path.name],
+                    )
+                    result["unchanged"].append(path.name)
+                    continue
+
+                try:
+                    with self._csv_source(conn, path, reader, memory_budget_mb, verify) as (source_sql, src_row_count):
+                        conn.begin()
+                        try:
+                            if track_header:
+                                self._mark_je_dirty(conn, path.name)
+                            conn.execute(f'DELETE FROM general_ledger WHERE "{LINEAGE_COLUMN}" = ?', [path.name])
+                            deleted_rows = conn.fetchone()[0]
+                            src_row_count, inserted_rows = self._insert_csv(conn, source_sql, src_row_count)
+                            self._record_manifest(conn, path, fingerprint, inserted_rows)
+                            if track_header:
+                                self._mark_je_dirty(conn, path.name)
+                            conn.commit()
+                        except Exception:
+                            conn.rollback()
+                            raise
+                except Exception as e:
+                    print(f"⚠️ 파일 적재 실패({path.name}): {e}")
+                    result["failed"].append(path.name)
+                    continue
+
+                status = "replaced" if entry else "added"
+                result[status].append(path.name)
+                print(
+                    f"{'🔄 교체' if entry else '🆕 신규'}: {path.name} "
+                    f"(삭제 {deleted_rows:,}행 / 원본 CSV {src_row_count:,}행 / DB 적재 {inserted_rows:,}행)"
+                )
 
-        return df
+            if prune_missing:
+                current = {path.name for path in csv_files}
+                for name in sorted(set(manifest) - current):
+                    conn.begin()
+                    if track_header:
+                        self._mark_je_dirty(conn, name)
+                    conn.execute(f'DELETE FROM general_ledger WHERE "{LINEAGE_COLUMN}" = ?', [name])
+                    deleted_rows = conn.fetchone()[0]
+                    conn.execute(f"DELETE FROM {MANIFEST_TABLE} WHERE source_file = ?", [name])
+                    conn.commit()
+                    result["removed"].append(name)
+                    print(f"🗑️ 삭제: {name} ({deleted_rows:,}행)")
+
+            self._fill_numeric_shadows(conn)
+            if track_header:
+                # 교체/신규/삭제된 파일의 전표만 je_header에서 다시 요약
+                self._refresh_je_header(conn)
+
+        print(
+            f"\n✅ 동기화 완료: 변경 없음 {len(result['unchanged'])} / 교체 {len(result['replaced'])} / "
+            f"신규 {len(result['added'])} / 삭제 {len(result['removed'])} / 실패 {len(result['failed'])}"
+        )
+        if cluster and (result["replaced"] or result["added"] or result["removed"]):
+            self.cluster_table()
+        if not has_table and result["added"]:
+            self.build_je_header()
+        if result["replaced"] or result["added"] or result["removed"]:
+            # 집계 큐브와 컬럼 통계는 라인 전체 기준이라 바뀐 파일이 있으면 다시 만듦
+            self.build_aggregate_cubes()
+            self.build_column_stats()
+        return result
+
+    def export_parquet_dataset(
+        self,
+        dataset_path: Path | str | None = None,
+        partition_cols: tuple[str, ...] = PARTITION_COLUMNS,
+        months: list[int] | None = None,
+    ) -> Path:
+        """
+        general_ledger를 Hive 파티션 Parquet 데이터셋으로 내보냅니다 (회계월=YYYYMM/ 폴더 구조).
+
+        Args:
+            dataset_path: 데이터셋 폴더. None이면 self.dataset_path, 그것도 없으면 DB 폴더의 gl_dataset
+            partition_cols: 파티션 컬럼. 첫 번째는 회계월이어야 하며 회사 컬럼 등을 뒤에 추가할 수 있음
+            months: 지정하면 해당 회계월 파티션만 다시 씀 (나머지 월은 그대로 유지)
+
+        Returns:
+            데이터셋 폴더 경로
+        """
+        if not partition_cols or partition_cols[0] != "회계월":
+            raise ValueError("첫 번째 파티션 컬럼은 '회계월'이어야 합니다.")
+        dataset = Path(dataset_path) if dataset_path else self.dataset_path or self.db_path.parent / DATASET_DIRNAME
+        partition_by = ", ".join(f'"{col}"' for col in partition_cols)
+
+        with self._connection() as conn:
+            if months is None:
+                print(f"📦 전체 데이터셋 작성 중... ({dataset})")
+                conn.execute(f"""
+                    COPY general_ledger TO {_sql_literal(dataset)}
+                    (FORMAT PARQUET, PARTITION_BY ({partition_by}), OVERWRITE)
+                """)
+            else:
+                print(f"📦 회계월 {len(months)}개 파티션 교체 중... ({dataset})")
+                for month in months:
+                    shutil.rmtree(dataset / f"{quote('회계월')}={int(month)}", ignore_errors=True)
+                month_list = ", ".join(str(int(month)) for month in months)
+                conn.execute(f"""
+                    COPY (SELECT * FROM general_ledger WHERE "회계월" IN ({month_list}))
+                    TO {_sql_literal(dataset)}
+                    (FORMAT PARQUET, PARTITION_BY ({partition_by}), APPEND)
+                """)
+            written_rows = conn.fetchone()[0]
+
+        print(f"✅ Parquet 데이터셋 작성 완료: {written_rows:,}행")
+        return dataset
+
+    def _data_version(self) -> tuple:
+        """
+        조회 결과 캐시의 버전 토큰.
+        이 엔진의 쓰기 횟수 + DB/WAL 파일의 (수정시각, 크기)로, 다른 프로세스의 적재도 감지합니다.
+        데이터셋은 폴더가 아니라 파티션 안의 Parquet 파일들을 기준으로 (파일 수, 최신 수정시각, 전체 크기)를 봅니다
+        (회계월= 폴더 안의 파일만 다시 쓰면 최상위 폴더의 수정시각은 바뀌지 않음).
+        """
+        def stat_of(path: Path | None) -> tuple[int, int] | None:
+            try:
+                stat = path.stat()
+            except (AttributeError, OSError):
+                return None
+            return stat.st_mtime_ns, stat.st_size
+
+        def dataset_stat(root: Path | None) -> tuple[int, int, int] | None:
+            if root is None:
+                return None
+            try:
+                stats = [path.stat() for path in root.rglob("*.parquet")]
+            except OSError:
+                return None
+            return len(stats), max((stat.st_mtime_ns for stat in stats), default=0), sum(stat.st_size for stat in stats)
+
+        wal_path = self.db_path.with_name(self.db_path.name + ".wal")
+        return self._write_count, stat_of(self.db_path), stat_of(wal_path), dataset_stat(self.dataset_path)
+
+    def _execute(
+        self, query: str, fetch, timeout: float | None = None, on_poll=None, cancel: threading.Event | None = None
+    ):
+        """
+        쿼리를 worker 스레드에서 실행하고 fetch(cursor) 결과를 반환.
+        호출한 스레드는 QUERY_POLL_INTERVAL_S마다 제한 시간을 확인하고 on_poll(경과 초, 진행률 %)을 호출합니다.
+        진행률은 DuckDB query_progress 값이며 아직 알 수 없으면 None입니다.
+        제한 시간을 넘기거나 on_poll이 예외를 던지면(UI의 취소 등) DuckDB interrupt로 쿼리를 즉시 중단합니다.
+
+        Args:
+            timeout: 제한 시간 (초). None이면 self.query_timeout_s, 0이면 제한 없음
+            cancel: 중단할 때 설정할 Event. fetch가 Python 루프(파일 쓰기 등)를 돌면 이 값을 보고 멈추도록 함
+        """
+        timeout = self.query_timeout_s if timeout is None else timeout
+        # 호출한 스레드의 cursor를 worker가 대신 사용 (호출한 스레드는 끝날 때까지 대기만 함)
+        with self._reading() as cursor:
+            future = self._query_pool.submit(lambda: fetch(cursor.execute(query)))
+            started = time.monotonic()
+            try:
+                while True:
+                    try:
+                        result = future.result(timeout=QUERY_POLL_INTERVAL_S)
+                    except FutureTimeoutError:
+                        pass
+                    else:
+                        self._record_profile(time.monotonic() - started)
+                        return result
+                    elapsed = time.monotonic() - started
+                    if timeout and elapsed > timeout:
+                        raise QueryTimeoutError(f"쿼리가 제한 시간 {timeout:g}초를 넘겨 중단되었습니다.")
+                    if on_poll is not None:
+                        percent = cursor.query_progress()
+                        on_poll(elapsed, min(percent, 100.0) if percent >= 0 else None)
+            except BaseException:
+                if cancel is not None:
+                    cancel.set()
+                if not future.done():
+                    cursor.interrupt()
+                    try:
+                        # 중단된 쿼리가 cursor 사용을 마칠 때까지 대기
+                        future.result(timeout=10)
+                    except BaseException:
+                        pass
+                raise
+
+    def _record_profile(self, elapsed: float, cached: bool = False) -> None:
+        """현재 스레드의 마지막 조회 정보 저장 (스캔/반환 행 수는 cursor의 JSON 프로파일에서 읽음)."""
+        profile = {"elapsed_s": elapsed, "rows_scanned": 0, "rows_returned": None, "cached": cached}
+        if not cached:
+            profile_path = Path(self._profile_dir.name) / f"{threading.get_ident()}.json"
+            try:
+                with open(profile_path, encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                profile["rows_scanned"] = None
+            else:
+                profile["rows_scanned"] = data.get("cumulative_rows_scanned")
+                profile["rows_returned"] = data.get("rows_returned")
+        self._last_profile.value = profile
+
+    def last_query_profile(self) -> dict | None:
+        """
+        현재 스레드에서 마지막으로 실행한 조회의 소요 시간, 스캔 행 수, 반환 행 수, 캐시 적중 여부.
+        스캔 행 수를 소요 시간으로 나누면 PC 간 처리량을 비교할 수 있습니다.
+        """
+        return getattr(self._last_profile, "value", None)
+
+    def _cached_result(self, query: str, kind: str, fetch, timeout: float | None = None, on_poll=None):
+        """
+        같은 SQL(공백 차이 무시), 같은 DB 버전, 같은 결과 형식(kind)의 결과를 캐시에서 반환.
+        없으면 fetch(cursor)로 실행해 캐시에 저장합니다 (실행은 _execute: 제한 시간/취소 지원).
+        """
+        version = self._data_version()
+        if version != self._cache_version:
+            if self._cache_version is not None:
+                # DB가 바뀌었으면 외부 적재 내용을 읽도록 연결도 다시 엶
+                self.close()
+            self._cache.clear()
+            self._cache_version = version
+
+        key = self._cache.make_key(query, (kind, version))
+        started = time.monotonic()
+        result = self._cache.get(key)
+        if result is not None:
+            self._record_profile(time.monotonic() - started, cached=True)
+        else:
+            result = self._execute(query, fetch, timeout, on_poll)
+            if isinstance(result, SpilledResult):
+                # 파일로 내린 결과는 세션별 핸들이 파일 수명을 관리하므로 캐시하지 않음
+                return result
+            self._cache.put(key, result)
+            if isinstance(result, pd.DataFrame):
+                result = result.copy(deep=False)  # 캐시에 넣은 DataFrame과 컬럼 교체가 섞이지 않도록
+        return result
+
+    def run_query(
+        self, query: str, use_cache: bool = True, timeout: float | None = None, on_poll=None
+    ) -> pd.DataFrame:
+        """
+        UI에서 요청한 쿼리 실행 결과를 Pandas DataFrame으로 반환 (읽기 전용 연결의 스레드별 cursor 사용).
+        use_cache=True면 같은 SQL(공백 차이 무시)과 같은 DB 버전의 결과를 캐시에서 반환합니다.
+        캐시 결과는 다른 호출과 데이터를 공유하므로 제자리 수정하지 마세요.
+        timeout / on_poll은 _execute 참고 (제한 시간 초과 시 QueryTimeoutError).
+        """
+        if not use_cache:
+            return self._execute(query, lambda cursor: cursor.df(), timeout, on_poll)
+        return self._cached_result(query, "pandas", lambda cursor: cursor.df(), timeout, on_poll)
+
+    def run_query_arrow(
+        self, query: str, use_cache: bool = True, timeout: float | None = None, on_poll=None
+    ) -> pa.Table:
+        """
+        쿼리 결과를 Arrow Table로 반환 (VARCHAR를 Python 문자열 객체로 바꾸지 않아 빠르고 메모리가 적음).
+        화면 표시와 CSV 내보내기는 Arrow 그대로 사용하고, pandas가 필요할 때만 to_pandas()로 변환하세요.
+        """
+        fetch = lambda cursor: cursor.fetch_arrow_table()
+        if not use_cache:
+            return self._execute(query, fetch, timeout, on_poll)
+        return self._cached_result(query, "arrow", fetch, timeout, on_poll)
+
+    def run_query_result(
+        self,
+        query: str,
+        max_memory_mb: float = SESSION_RESULT_MAX_MB,
+        use_cache: bool = True,
+        timeout: float | None = None,
+        on_poll=None,
+    ) -> pa.Table | SpilledResult:
+        """
+        화면 탭에서 session_state에 보관할 결과용 조회.
+        SPILL_BATCH_ROWS 단위로 가져오다가 max_memory_mb를 넘으면 이미 가져온 부분과 나머지를 임시 Parquet 파일로 쓰고
+        SpilledResult 핸들을 반환합니다 (세션마다 큰 Arrow Table을 메모리에 들고 있지 않도록).
+        한도 이하 결과는 run_query_arrow와 같은 Arrow Table이며 캐시를 사용합니다.
+        """
+        max_bytes = int(max_memory_mb * 1024 * 1024)
+
+        def fetch(cursor):
+            reader = cursor.fetch_record_batch(SPILL_BATCH_ROWS)
+            batches, nbytes = [], 0
+            for batch in reader:
+                batches.append(batch)
+                nbytes += batch.nbytes
+                if nbytes > max_bytes:
+                    return self._spill_batches(reader, batches)
+            return pa.Table.from_batches(batches, reader.schema)
+
+        if not use_cache:
+            return self._execute(query, fetch, timeout, on_poll)
+        return self._cached_result(query, "result", fetch, timeout, on_poll)
+
+    def _spill_batches(self, reader: pa.RecordBatchReader, batches: list[pa.RecordBatch]) -> SpilledResult:
+        """이미 가져온 batches와 reader의 나머지를 임시 Parquet 파일에 쓰고 핸들 반환 (실패/취소 시 파일 삭제)."""
+        path = Path(self._result_dir.name) / f"{uuid.uuid4().hex}.parquet"
+        nbytes = 0
+        try:
+            with pq.ParquetWriter(path, reader.schema, compression="zstd") as writer:
+                for batch in batches:
+                    writer.write_batch(batch)
+                    nbytes += batch.nbytes
+                batches.clear()
+                for batch in reader:
+                    writer.write_batch(batch)
+                    nbytes += batch.nbytes
+        except BaseException:
+            path.unlink(missing_ok=True)
+            raise
+        return SpilledResult(path, nbytes)
+
+    def count_rows(self, query: str, timeout: float | None = None, on_poll=None) -> int:
+        """쿼리 결과 행 수 (결과를 가져오지 않고 DuckDB에서 COUNT만 계산, 결과 캐시 사용)."""
+        table = self.run_query_arrow(f"SELECT COUNT(*) AS cnt FROM ({query}) AS q", timeout=timeout, on_poll=on_poll)
+        return table["cnt"][0].as_py()
+
+    def numeric_summary(self, query: str, timeout: float | None = None, on_poll=None) -> list[dict]:
+        """
+        query 전체 결과의 숫자형 컬럼별 합계 / 유효 행 수 / 최소 / 최대 (컬럼마다 1행).
+        결과 행을 가져오지 않고 DuckDB 집계 한 번으로 계산하므로, LIMIT 없는 쿼리를 넘기면 화면 표시 제한과 관계없이 정확합니다.
+        BALANCE_COLUMNS가 모두 있으면 합계만 있는 BALANCE_LABEL 행을 마지막에 추가합니다. 결과 캐시 사용.
+        """
+        described = self.run_query_arrow(f"DESCRIBE SELECT * FROM ({query}) AS q", timeout=timeout, on_poll=on_poll)
+        numeric = [
+            name for name, dtype in zip(described["column_name"].to_pylist(), described["column_type"].to_pylist())
+            if is_numeric_type(dtype)
+        ]
+        if not numeric:
+            return []
+
+        fields = []
+        for i, col in enumerate(numeric):
+            fields += [
+                f'SUM("{col}")::DOUBLE AS sum_{i}',
+                f'COUNT("{col}") AS count_{i}',
+                f'MIN("{col}")::DOUBLE AS min_{i}',
+                f'MAX("{col}")::DOUBLE AS max_{i}',
+            ]
+        row = self.run_query_arrow(
+            f"SELECT {', '.join(fields)} FROM ({query}) AS q", timeout=timeout, on_poll=on_poll
+        ).to_pylist()[0]
+
+        summary = [
+            {
+                "컬럼명": col,
+                "합계": row[f"sum_{i}"] or 0,
+                "유효 행 수": row[f"count_{i}"],
+                "최소": row[f"min_{i}"],
+                "최대": row[f"max_{i}"],
+            }
+            for i, col in enumerate(numeric)
+        ]
+        if all(col in numeric for col in BALANCE_COLUMNS):
+            debit, credit = (summary[numeric.index(col)]["합계"] for col in BALANCE_COLUMNS)
+            summary.append({"컬럼명": BALANCE_LABEL, "합계": debit - credit, "유효 행 수": None, "최소": None, "최대": None})
+        return summary
+
+    def fetch_page(
+        self,
+        query: str,
+        after: tuple | None = None,
+        page_size: int = 1000,
+        key_cols: tuple[str, ...] = PAGE_KEY_COLUMNS,
+        timeout: float | None = None,
+        on_poll=None,
+    ) -> pa.Table:
+        """
+        쿼리 결과를 key_cols 순서로 정렬했을 때 after 다음부터 page_size 행을 반환 (keyset 페이지 조회).
+        OFFSET 없이 마지막 키 이후만 읽으므로 어느 페이지든 필터 결과 전체를 가져오지 않습니다.
+        다음 페이지의 after는 이 결과 마지막 행의 key_cols 값입니다 (NULL 포함).
+        key_cols 값이 NULL인 행은 NULLS LAST로 뒤쪽 페이지에 나오므로, count_rows의 전체 행 수와 모든 페이지의 행 수 합이 같습니다.
+        """
+        where = f"WHERE {_keyset_condition(key_cols, after)}" if after is not None else ""
+        order_by = ", ".join(f'q."{col}" NULLS LAST' for col in key_cols)
+        return self.run_query_arrow(f"""
+            SELECT * FROM ({query}) AS q
+            {where}
+            ORDER BY {order_by}
+            LIMIT {int(page_size)}
+        """, timeout=timeout, on_poll=on_poll)
+
+    @property
+    def export_dir(self) -> Path:
+        """내보내기 파일 기본 폴더 (DB 파일 폴더의 exports)."""
+        return self.db_path.parent / EXPORT_FOLDER_NAME
+
+    def export_query(
+        self,
+        query: str,
+        dest: Path | str,
+        fmt: Literal["csv", "parquet"] = "csv",
+        max_rows_per_file: int | None = None,
+        timeout: float | None = None,
+        on_poll=None,
+    ) -> list[Path]:
+        """
+        쿼리 결과 전체를 파일로 내보냅니다. 결과를 DataFrame/바이트로 만들지 않아 행 수가 많아도 메모리가 늘지 않습니다.
+        - csv: record batch(EXPORT_BATCH_ROWS행)를 받아 차례로 UTF-8(BOM) CSV에 씀.
+          max_rows_per_file을 주면 그 행 수마다 파일을 나눔 (엑셀용: result_export.EXCEL_MAX_ROWS)
+        - parquet: DuckDB COPY로 바로 씀
+
+        Args:
+            dest: 확장자를 뺀 대상 경로 (폴더가 없으면 생성)
+            timeout/on_poll: _execute 참고 (취소되면 만든 파일은 지움)
+
+        Returns:
+            만든 파일 경로 목록
+        """
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        query = query.strip().rstrip(";")
+        if fmt == "parquet":
+            path = dest.with_suffix(".parquet")
+            try:
+                self._execute(
+                    f"COPY ({query}) TO {_sql_literal(path)} (FORMAT parquet, COMPRESSION zstd)",
+                    lambda cursor: cursor.fetchall(), timeout, on_poll,
+                )
+            except BaseException:
+                path.unlink(missing_ok=True)
+                raise
+            return [path]
+        if fmt == "csv":
+            # interrupt는 DuckDB 실행만 멈추므로, worker의 CSV 쓰기 루프는 cancel을 보고 batch 사이에서 멈춤
+            cancel = threading.Event()
+            return self._execute(
+                query,
+                lambda cursor: write_csv_batches(
+                    cursor.fetch_record_batch(EXPORT_BATCH_ROWS), dest, max_rows_per_file, cancel
+                ),
+                timeout, on_poll, cancel,
+            )
+        raise ValueError(f"지원하지 않는 내보내기 형식입니다: {fmt}")
+
+    def column_types(self) -> dict[str, str]:
+        """조회 대상 general_ledger의 {컬럼명: DuckDB 타입} (PRAGMA table_info, 결과 캐시 사용)."""
+        info = self.run_query_arrow("PRAGMA table_info('general_ledger')")
+        return dict(zip(info["name"].to_pylist(), info["type"].to_pylist()))
+
+    def aggregate_cubes(self) -> list[dict]:
+        """
+        집계 큐브 카탈로그 (행 수가 작은 순서). Parquet 데이터셋을 조회 중이면 DB의 큐브와 내용이 다를 수 있어 빈 목록.
+        각 항목: {"cube_name", "dimensions", "measures", "row_count"}
+        """
+        if self.dataset_path is not None:
+            return []
+        exists = self.run_query_arrow(
+            f"SELECT COUNT(*) AS cnt FROM duckdb_tables() WHERE table_name = '{CUBE_CATALOG_TABLE}'"
+        )
+        if not exists["cnt"][0].as_py():
+            return []
+        catalog = self.run_query_arrow(
+            f"SELECT cube_name, dimensions, measures, row_count FROM {CUBE_CATALOG_TABLE} ORDER BY row_count"
+        )
+        return catalog.to_pylist()
+
+    def column_stats(self) -> dict[str, dict]:
+        """
+        컬럼 통계 카탈로그 {컬럼명: 통계}. 카탈로그가 없거나 Parquet 데이터셋을 조회 중이면 빈 dict.
+        각 통계: {"column_type", "row_count", "null_count", "approx_distinct", "min_value", "max_value",
+        "top_values": [{"value", "count"}, ...]}
+        """
+        if self.dataset_path is not None:
+            return {}
+        exists = self.run_query_arrow(
+            f"SELECT COUNT(*) AS cnt FROM duckdb_tables() WHERE table_name = '{COLUMN_STATS_TABLE}'"
+        )
+        if not exists["cnt"][0].as_py():
+            return {}
+        catalog = self.run_query_arrow(f"SELECT * EXCLUDE (built_at) FROM {COLUMN_STATS_TABLE}")
+        return {row.pop("column_name"): row for row in catalog.to_pylist()}
+
+    def has_je_header(self) -> bool:
+        """
+        조회 대상 DB에 전표 요약 테이블(je_header)이 있는지 여부.
+        Parquet 데이터셋을 조회 중이면 DB의 je_header와 데이터셋 내용이 다를 수 있어 False (라인에서 직접 조건 적용).
+        """
+        if self.dataset_path is not None:
+            return False
+        table = self.run_query_arrow(
+            f"SELECT COUNT(*) AS cnt FROM duckdb_tables() WHERE table_name = '{JE_HEADER_TABLE}'"
+        )
+        return table["cnt"][0].as_py() > 0
+
+    def cache_stats(self) -> dict[str, float]:
+        """run_query 결과 캐시의 적중/미적중 횟수와 보관량."""
+        return self._cache.stats()
 
 
 # --- 확인용 코드 ---
@@ -252,12 +1933,16 @@ if __name__ == "__main__":
     try:
         # 1단계: 스키마 초기화 및 빈 테이블 생성
         print("\n[Step 1] 테이블 스키마 준비 중...")
-        schema = engine.collect_schema()
+        schema, _ = engine.discover_schema()
         engine.create_table(schema)
         
         # 2단계: 폴더 내 모든 파일 순차 적재
         print("\n[Step 2] 데이터 적재 및 무결성 검사 중...")
-        engine.ingest_all_raw_data()
+        engine.ingest_all_raw_data(parallel=True)
+
+        # 전표 단위 조회(Step2)가 전체 스캔을 하지 않도록 정렬 + 전표번호 인덱스
+        print("\n[Step 2-1] 회계월/전표번호 순서로 재정렬 중...")
+        engine.cluster_table(create_index=True)
         
         # 3단계: 최종 데이터 확인
         print("\n[Step 3] 검증...")
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+
+from csv_encoding import detect_encoding
+from trx_hash import HASH_COLUMN, add_trx_group_hash
+
+RAW_FOLDER_PATH = Path("data/working/before_processing")  # 전처리 전 원본 CSV 위치
+
+# 전처리 단계에서 추가되는 컬럼과 DB 타입
+SIGNED_AMOUNT_COLUMN = "전표금액_부호추가"
+DERIVED_TYPES = {
+    HASH_COLUMN: "VARCHAR",
+    SIGNED_AMOUNT_COLUMN: "DOUBLE",
+    "전기일자_연도": "INTEGER",
+    "전표일자_월": "INTEGER",
+}
+
+
+def read_raw_csv(path: Path, nrows: int | None = None) -> pd.DataFrame:
+    """원본 CSV를 문자열 DataFrame으로 읽음 (인코딩은 앞부분 표본으로 판정하여 한 번만 읽음)."""
+    return pd.read_csv(path, dtype=str, header=0, nrows=nrows, encoding=detect_encoding(path))
+
+
+def preprocess_frame(df: pd.DataFrame, all_columns: list[str], numeric_cols: list[str]) -> pd.DataFrame:
+    """
+    csv_data_normalizaion.ipynb의 1, 2번 셀 변환을 한 번에 적용.
+    컬럼명 대문자 → all_columns 기준 reindex → 숫자형 변환 → 거래유형 해시 → 부호 금액 → 연도/월.
+    """
+    # 1️⃣ 컬럼명 대문자 변환 및 전체 컬럼 기준 정렬
+    df.columns = [col.upper() for col in df.columns]
+    df = df.reindex(columns=all_columns)
+
+    # 2️⃣ 숫자형 컬럼 변환 (천 단위 쉼표 제거, 변환 불가 값은 예외)
+    numeric_cols = [col for col in numeric_cols if col in df.columns]
+    df[numeric_cols] = df[numeric_cols].apply(
+        lambda x: pd.to_numeric(x.astype("string").str.replace(",", "", regex=False), errors="raise")
+    )
+
+    # 3️⃣ 거래유형 해시
+    df = add_trx_group_hash(df, je_col="전표번호", coa_col="계정과목코드")
+
+    # 4️⃣ 차대구분이 C인 행만 음수로 표시한 금액
+    credit = df["차대구분"].eq("C") if "차대구분" in df.columns else pd.Series(False, index=df.index)
+    df[SIGNED_AMOUNT_COLUMN] = df["전표금액"].where(~credit, -df["전표금액"])
+
+    # 5️⃣ 전기일자(YYYY-mm-dd)에서 연도, 월 추출
+    try:
+        전기일자_parsed = pd.to_datetime(df["전기일자"], format="%Y-%m-%d")
+    except Exception as e:
+        raise ValueError(f"'전기일자' 컬럼을 날짜로 변환할 수 없습니다: {e}")
+    df["전기일자_연도"] = 전기일자_parsed.dt.year
+    df["전표일자_월"] = 전기일자_parsed.dt.month
+
+    return df
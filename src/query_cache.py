@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+DEFAULT_CACHE_MAX_MB = 256  # 메모리에 보관할 조회 결과 총량
+DEFAULT_SPILL_MAX_MB = 2048  # 디스크(spill 폴더)에 보관할 조회 결과 총량
+
+# 작은따옴표 문자열 리터럴 ('' 이스케이프 포함)과 그 밖의 부분을 구분
+_SQL_LITERAL_PATTERN = re.compile(r"('(?:[^']|'')*')")
+
+
+def normalize_sql(query: str) -> str:
+    """캐시 키용 SQL 정규화: 문자열 리터럴 밖의 연속 공백을 한 칸으로 줄이고 앞뒤 공백과 끝의 ';' 제거."""
+    parts = _SQL_LITERAL_PATTERN.split(query.strip().rstrip(";").strip())
+    return "".join(part if i % 2 else re.sub(r"\s+", " ", part) for i, part in enumerate(parts))
+
+
+def _result_nbytes(result: pd.DataFrame | pa.Table) -> int:
+    if isinstance(result, pa.Table):
+        return result.nbytes
+    return int(result.memory_usage(deep=True).sum())
+
+
+def _shared(result: pd.DataFrame | pa.Table) -> pd.DataFrame | pa.Table:
+    # Arrow Table은 불변이라 그대로 반환, DataFrame은 컬럼 교체가 캐시에 영향을 주지 않도록 얕은 복사
+    return result if isinstance(result, pa.Table) else result.copy(deep=False)
+
+
+class SpilledResult:
+    """
+    디스크(Parquet)로 내린 큰 조회 결과의 핸들.
+    세션에는 이 객체만 보관하고, 화면 표시는 slice()로 필요한 row group만 읽습니다.
+    num_rows / nbytes / column_names / schema / slice()는 pa.Table과 같은 이름이라 표시 코드를 같이 씁니다.
+    핸들을 더 이상 참조하지 않으면 (새 결과로 교체, 세션 종료) 파일을 지웁니다.
+    """
+
+    def __init__(self, path: Path | str, nbytes: int):
+        self.path = Path(path)
+        self.nbytes = nbytes  # 메모리에 올렸을 때의 Arrow 크기
+        metadata = pq.read_metadata(self.path)
+        self.num_rows = metadata.num_rows
+        self.schema = metadata.schema.to_arrow_schema()
+        self.column_names = self.schema.names
+        self._row_group_rows = [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)]
+        weakref.finalize(self, self.path.unlink, missing_ok=True)
+
+    def slice(self, offset: int = 0, length: int | None = None) -> pa.Table:
+        """offset행부터 length행을 읽어 Arrow Table로 반환 (해당 구간의 row group만 읽음)."""
+        end = self.num_rows if length is None else min(offset + length, self.num_rows)
+        groups, first_row, row = [], 0, 0
+        for i, group_rows in enumerate(self._row_group_rows):
+            if row + group_rows > offset and row < end:
+                if not groups:
+                    first_row = row
+                groups.append(i)
+            row += group_rows
+        if not groups:
+            return self.schema.empty_table()
+        with pq.ParquetFile(self.path) as parquet:
+            return parquet.read_row_groups(groups).slice(offset - first_row, end - offset)
+
+    def to_batches(self):
+        """row group 단위로 RecordBatch를 하나씩 읽는 iterator (전체를 메모리에 올리지 않는 합계 계산 등)."""
+        with pq.ParquetFile(self.path) as parquet:
+            yield from parquet.iter_batches()
+
+
+class QueryResultCache:
+    """
+    (정규화 SQL, DB 버전) 기준 조회 결과 LRU 캐시 (pandas DataFrame / Arrow Table).
+    메모리 한도를 넘으면 오래 쓰지 않은 결과부터 내보내며, spill_dir이 있으면 Parquet으로 옮겨 보관합니다.
+    반환되는 DataFrame은 캐시와 데이터를 공유하는 얕은 복사본이므로 제자리 수정(inplace)하지 마세요.
+    """
+
+    def __init__(
+        self,
+        max_mb: float = DEFAULT_CACHE_MAX_MB,
+        spill_dir: Path | str | None = None,
+        spill_max_mb: float = DEFAULT_SPILL_MAX_MB,
+    ):
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.spill_max_bytes = int(spill_max_mb * 1024 * 1024)
+
+        self._memory: OrderedDict[str, tuple[pd.DataFrame | pa.Table, int]] = OrderedDict()
+        self._spilled: OrderedDict[str, tuple[Path, int, bool]] = OrderedDict()  # (파일, 크기, Arrow 여부)
+        self._memory_bytes = 0
+        self._spill_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.spill_hits = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(query: str, version: object) -> str:
+        return hashlib.md5(f"{version!r}\n{normalize_sql(query)}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> pd.DataFrame | pa.Table | None:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return _shared(self._memory[key][0])
+
+            if key in self._spilled:
+                path, _, is_arrow = self._spilled[key]
+                try:
+                    result = pq.read_table(path) if is_arrow else pd.read_parquet(path)
+                except Exception:
+                    self._drop_spilled(key)
+                else:
+                    self.hits += 1
+                    self.spill_hits += 1
+                    if _result_nbytes(result) <= self.max_bytes:
+                        # 다시 쓰인 결과는 메모리로 올림
+                        self._drop_spilled(key)
+                        self._store(key, result)
+                    else:
+                        self._spilled.move_to_end(key)
+                    return _shared(result)
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, result: pd.DataFrame | pa.Table) -> None:
+        with self._lock:
+            if key in self._memory or key in self._spilled:
+                return
+            self._store(key, result)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            for key in list(self._spilled):
+                self._drop_spilled(key)
+
+    def stats(self) -> dict[str, float]:
+        """적중/미적중 횟수와 현재 보관량."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "spill_hits": self.spill_hits,
+                "evictions": self.evictions,
+                "entries": len(self._memory),
+                "memory_mb": self._memory_bytes / 1024 / 1024,
+                "spilled_entries": len(self._spilled),
+                "spill_mb": self._spill_bytes / 1024 / 1024,
+            }
+
+    # --- 내부 처리 (self._lock 안에서 호출) ---
+    def _store(self, key: str, result: pd.DataFrame | pa.Table) -> None:
+        nbytes = _result_nbytes(result)
+        if nbytes > self.max_bytes:
+            # 메모리 한도보다 큰 결과는 바로 디스크로
+            self._spill(key, result)
+            return
+
+        self._memory[key] = (result, nbytes)
+        self._memory_bytes += nbytes
+        while self._memory_bytes > self.max_bytes:
+            old_key, (old_result, old_bytes) = self._memory.popitem(last=False)
+            self._memory_bytes -= old_bytes
+            self.evictions += 1
+            self._spill(old_key, old_result)
+
+    def _spill(self, key: str, result: pd.DataFrame | pa.Table) -> None:
+        if self.spill_dir is None:
+            return
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        path = self.spill_dir / f"{key}.parquet"
+        is_arrow = isinstance(result, pa.Table)
+        try:
+            if is_arrow:
+                pq.write_table(result, path)
+            else:
+                result.to_parquet(path, index=False)
+        except Exception:
+            # Parquet으로 쓸 수 없는 결과(혼합 타입 object 컬럼 등)는 보관하지 않음
+            path.unlink(missing_ok=True)
+            return
+
+        size = path.stat().st_size
+        if size > self.spill_max_bytes:
+            path.unlink(missing_ok=True)
+            return
+        self._spilled[key] = (path, size, is_arrow)
+        self._spill_bytes += size
+        while self._spill_bytes > self.spill_max_bytes:
+            self._drop_spilled(next(iter(self._spilled)))
+
+    def _drop_spilled(self, key: str) -> None:
+        path, size, _ = self._spilled.pop(key)
+        self._spill_bytes -= size
+        path.unlink(missing_ok=True)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import math
+from datetime import datetime
+
+import pyarrow as pa
+import streamlit as st
+
+from db_engine import DEFAULT_QUERY_TIMEOUT_S, GLEngine
+from query_cache import SpilledResult
+from result_export import EXCEL_MAX_ROWS
+
+QUERY_TIMEOUT_KEY = "query_timeout_s"  # 사이드바의 쿼리 제한 시간 입력 (초, 0이면 제한 없음)
+MAX_DISPLAY_SIZE_MB = 200  # 메모리 결과가 이보다 크면 구간 단위로만 표시
+DISPLAY_PAGE_ROWS = 100_000  # 큰 결과를 화면에 한 번에 표시하는 행 수
+
+
+def query_timeout() -> float:
+    """사이드바에서 설정한 쿼리 제한 시간 (초)."""
+    return float(st.session_state.get(QUERY_TIMEOUT_KEY, DEFAULT_QUERY_TIMEOUT_S))
+
+
+def run_cancellable(run, message: str, key: str):
+    """
+    run(timeout=..., on_poll=...) 형태의 엔진 조회를 실행하면서 진행률, 경과 시간과 취소 버튼을 표시.
+    실행 중 취소 버튼을 누르면 Streamlit이 스크립트를 다시 실행하면서 on_poll의 화면 갱신에서 예외가 발생하고,
+    엔진이 DuckDB interrupt로 쿼리를 중단합니다. 취소되었는지는 was_cancelled(key)로 확인하세요.
+    """
+    status = st.empty()
+    with status.container():
+        st.button("⏹ 쿼리 취소", key=key)
+        progress = st.empty()
+        progress.caption(f"⏳ {message}")
+
+    def on_poll(elapsed: float, percent: float | None) -> None:
+        if percent is None:
+            progress.caption(f"⏳ {message} ({elapsed:,.1f}초 경과)")
+        else:
+            progress.progress(percent / 100, text=f"⏳ {message} {percent:.0f}% ({elapsed:,.1f}초 경과)")
+
+    try:
+        return run(timeout=query_timeout(), on_poll=on_poll)
+    finally:
+        status.empty()
+
+
+def format_query_profile(profile: dict | None) -> str:
+    """GLEngine.last_query_profile() 결과를 '소요 시간 · 스캔 행 수 (처리량)' 문구로 변환."""
+    if not profile:
+        return ""
+    if profile["cached"]:
+        return "⚡ 캐시된 결과"
+    text = f"⏱ {profile['elapsed_s']:,.2f}초"
+    rows_scanned = profile["rows_scanned"]
+    if rows_scanned:
+        text += f" · 스캔 {rows_scanned:,}행 ({rows_scanned / max(profile['elapsed_s'], 1e-3):,.0f}행/초)"
+    return text
+
+
+def was_cancelled(key: str) -> bool:
+    """직전 실행이 run_cancellable의 취소 버튼으로 중단되었는지 여부."""
+    return bool(st.session_state.get(key))
+
+
+def is_large_result(result: pa.Table | SpilledResult) -> bool:
+    """파일로 내린 결과이거나 메모리 결과가 MAX_DISPLAY_SIZE_MB보다 커서 구간 단위로 표시해야 하는지 여부."""
+    return isinstance(result, SpilledResult) or result.nbytes / 1024 / 1024 > MAX_DISPLAY_SIZE_MB
+
+
+def render_large_result(result: pa.Table | SpilledResult, key: str) -> None:
+    """
+    큰 결과를 DISPLAY_PAGE_ROWS행 구간 단위로 표시.
+    파일로 내린 결과(SpilledResult)는 선택한 구간의 row group만 읽으므로 전체를 메모리에 올리지 않습니다.
+    """
+    result_memory_mb = result.nbytes / 1024 / 1024
+    where = "임시 파일에 보관되어" if isinstance(result, SpilledResult) else "커서"
+    st.warning(
+        f"⚠️ 결과 크기가 {result_memory_mb:.1f}MB로 {where} 화면에는 {DISPLAY_PAGE_ROWS:,}행씩 표시되며, "
+        f"전체 데이터는 파일 내보내기를 이용해주세요."
+    )
+    page_count = max(1, math.ceil(result.num_rows / DISPLAY_PAGE_ROWS))
+    page = 1
+    if page_count > 1:
+        page = st.number_input("표시 구간", min_value=1, max_value=page_count, value=1, step=1, key=key)
+    start = (page - 1) * DISPLAY_PAGE_ROWS
+    display_result = result.slice(start, DISPLAY_PAGE_ROWS)
+    st.dataframe(display_result, use_container_width=True, hide_index=True)
+    st.info(
+        f"전체 {result.num_rows:,}행 중 {start + 1:,}~{start + display_result.num_rows:,}행 표시 "
+        f"(구간 {page}/{page_count})"
+    )
+
+
+def render_export_controls(engine: GLEngine, query: str, file_stem: str, key: str) -> None:
+    """
+    결과 전체를 DB 폴더의 exports에 파일로 내보내는 컨트롤 (GLEngine.export_query).
+    화면 표시용 LIMIT이 없는 query를 다시 실행해 DuckDB 결과를 파일로 바로 쓰므로, 결과가 커도 앱 메모리가 늘지 않습니다.
+    """
+    with st.expander("📁 전체 결과 파일로 내보내기", expanded=False):
+        fmt = st.radio(
+            "파일 형식",
+            options=["csv", "parquet"],
+            format_func={"csv": "CSV (UTF-8 BOM)", "parquet": "Parquet"}.get,
+            horizontal=True,
+            key=f"{key}_format",
+        )
+        split = st.checkbox(
+            f"엑셀 행 제한({EXCEL_MAX_ROWS:,}행)마다 파일 나누기", value=True, key=f"{key}_split", disabled=fmt != "csv"
+        )
+        st.caption(f"저장 폴더: {engine.export_dir}")
+        if st.button("내보내기 실행", key=f"{key}_run"):
+            dest = engine.export_dir / f"{file_stem}_{datetime.now():%Y%m%d_%H%M%S}"
+            max_rows = EXCEL_MAX_ROWS if fmt == "csv" and split else None
+            try:
+                paths = run_cancellable(
+                    lambda **control: engine.export_query(query, dest, fmt, max_rows, **control),
+                    "결과를 파일로 내보내는 중...", key=f"{key}_cancel",
+                )
+            except Exception as exc:
+                st.error(f"내보내기 실패: {exc}")
+            else:
+                st.success(f"파일 {len(paths)}개 저장 완료 · {format_query_profile(engine.last_query_profile())}")
+                st.code("\n".join(str(path) for path in paths), language=None)
+        if was_cancelled(f"{key}_cancel"):
+            st.info("⏹ 내보내기를 취소했습니다.")
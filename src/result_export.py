@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import codecs
+import csv
+import io
+import threading
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+
+from query_cache import SpilledResult
+
+
+EXCEL_MAX_ROWS = 1_048_575  # 엑셀 시트 최대 행 수(1,048,576)에서 헤더 1행을 뺀 데이터 행 수
+
+_CSV_WRITE_OPTIONS = pa_csv.WriteOptions(include_header=False, quoting_style="needed")
+
+
+def _csv_preamble(column_names: list[str]) -> bytes:
+    """UTF-8 BOM + 헤더 행. 헤더는 pandas to_csv와 같이 필요할 때만 따옴표 처리."""
+    header = io.StringIO()
+    csv.writer(header, lineterminator="\n").writerow(column_names)
+    return codecs.BOM_UTF8 + header.getvalue().encode("utf-8")
+
+
+def csv_bytes(table: pa.Table) -> bytes:
+    """
+    Arrow Table을 엑셀에서 바로 열리는 UTF-8(BOM) CSV 바이트로 변환.
+    pandas 변환 없이 Arrow CSV writer로 씁니다.
+    """
+    buffer = io.BytesIO()
+    buffer.write(_csv_preamble(table.column_names))
+    pa_csv.write_csv(table, buffer, _CSV_WRITE_OPTIONS)
+    return buffer.getvalue()
+
+
+def write_csv_batches(
+    reader: pa.RecordBatchReader,
+    dest: Path | str,
+    max_rows_per_file: int | None = None,
+    cancel: threading.Event | None = None,
+) -> list[Path]:
+    """
+    Arrow record batch reader의 batch를 차례로 UTF-8(BOM) CSV 파일에 씁니다 (결과 전체를 메모리에 올리지 않음).
+    max_rows_per_file을 넘으면 파일을 나누며, 이때 파일명은 {dest}_001.csv, {dest}_002.csv ...
+    나누지 않으면 {dest}.csv 한 개. 쓰는 도중 실패하거나 취소되면 만든 파일을 지우고 예외를 다시 던집니다.
+    cancel이 설정되면 다음 batch를 쓰기 전에 InterruptedError로 멈춥니다 (DuckDB interrupt는 이 쓰기 루프를 멈추지 않음).
+
+    Returns:
+        만든 파일 경로 목록
+    """
+    dest = Path(dest)
+    dest = dest.with_name(dest.name.removesuffix(".csv"))
+    paths: list[Path] = []
+    file = None
+    preamble = _csv_preamble(reader.schema.names)
+    rows_in_file = 0
+
+    def open_next() -> None:
+        nonlocal file, rows_in_file
+        if file is not None:
+            file.close()
+        if len(paths) == 1:
+            # 두 번째 파일이 필요해지면 첫 파일도 번호가 붙은 이름으로 변경
+            paths[0] = paths[0].rename(paths[0].with_name(f"{dest.name}_001.csv"))
+        path = dest.with_name(f"{dest.name}_{len(paths) + 1:03d}.csv" if paths else f"{dest.name}.csv")
+        file = open(path, "wb")
+        file.write(preamble)
+        paths.append(path)
+        rows_in_file = 0
+
+    try:
+        open_next()
+        for batch in reader:
+            if cancel is not None and cancel.is_set():
+                raise InterruptedError("파일 내보내기가 취소되었습니다.")
+            offset = 0
+            while offset < batch.num_rows:
+                if max_rows_per_file and rows_in_file >= max_rows_per_file:
+                    open_next()
+                take = batch.num_rows - offset
+                if max_rows_per_file:
+                    take = min(take, max_rows_per_file - rows_in_file)
+                pa_csv.write_csv(batch.slice(offset, take), file, _CSV_WRITE_OPTIONS)
+                offset += take
+                rows_in_file += take
+    except BaseException:
+        if file is not None:
+            file.close()
+        for path in paths:
+            path.unlink(missing_ok=True)
+        raise
+    file.close()
+    return paths
+
+
+def numeric_column_sums(table: pa.Table | SpilledResult) -> list[dict[str, str]]:
+    """숫자형 컬럼별 합계와 유효 행 수 (화면 표시용 문자열). 파일로 내린 결과는 batch 단위로 읽어 더합니다."""
+    numeric = [
+        field.name for field in table.schema
+        if pa.types.is_integer(field.type) or pa.types.is_floating(field.type) or pa.types.is_decimal(field.type)
+    ]
+    if not numeric:
+        return []
+
+    sums = dict.fromkeys(numeric, 0)
+    counts = dict.fromkeys(numeric, 0)
+    for batch in table.to_batches():
+        for name in numeric:
+            column = batch.column(name)
+            sums[name] += pc.sum(column).as_py() or 0
+            counts[name] += len(column) - column.null_count
+
+    summary = []
+    for name in numeric:
+        col_sum = sums[name]
+        summary.append({
+            "컬럼명": name,
+            "합계": f"{col_sum:,.0f}" if col_sum == int(col_sum) else f"{col_sum:,.2f}",
+            "유효 행 수": f"{counts[name]:,}",
+        })
+    return summary
@@ -1,8 +1,104 @@
 from __future__ import annotations
 
+import re
+
 import streamlit as st
 
-from db_engine import GLEngine
+from db_engine import CUBE_ROWS_COLUMN, NUMERIC_SHADOW_SUFFIX, GLEngine, is_numeric_type
+from query_control import (
+    format_query_profile,
+    is_large_result,
+    render_export_controls,
+    render_large_result,
+    run_cancellable,
+    was_cancelled,
+)
+from result_export import csv_bytes
+
+
+AGG_FUNCTIONS = ["SUM", "COUNT", "AVG", "MIN", "MAX", "DISTINCT", "MEDIAN"]  # DISTINCT: 고유값 수, MEDIAN: 중앙값
+
+APPROX_SAMPLE_PERCENTS = [1, 5, 10, 25]  # 근사 집계 표본 비율 (%)
+SAMPLE_BLOCK_ROWS = 2048  # DuckDB system 표본의 추출 단위 (vector 크기). 오차는 이 블록 단위로 계산
+APPROX_Z = 1.96  # 오차 컬럼의 95% 신뢰구간 계수
+APPROX_ERROR_SUFFIX = "_오차"  # 추정치 ± 값 (95% 신뢰구간 반폭) 컬럼 접미사
+
+# 작은따옴표 문자열 리터럴 / 쌍따옴표 식별자 / 일반 식별자
+_SQL_STRING_PATTERN = re.compile(r"'(?:[^']|'')*'")
+_SQL_IDENTIFIER_PATTERN = re.compile(r'"((?:[^"]|"")+)"|([A-Za-z_\uac00-\ud7a3][\w\uac00-\ud7a3]*)')
+
+
+def _referenced_columns(condition: str | None, columns: list[str]) -> set[str]:
+    """조건문에서 테이블 컬럼명으로 쓰인 식별자 (문자열 리터럴 안은 제외, 대소문자 무시)."""
+    if not condition or not condition.strip():
+        return set()
+    by_name = {col.lower(): col for col in columns}
+    text = _SQL_STRING_PATTERN.sub("''", condition)
+    found = set()
+    for quoted, bare in _SQL_IDENTIFIER_PATTERN.findall(text):
+        name = (quoted.replace('""', '"') if quoted else bare).lower()
+        if name in by_name:
+            found.add(by_name[name])
+    return found
+
+
+def _cube_aggregate(col: str, func: str, cube: dict) -> str | None:
+    """큐브에서 다시 집계하는 식. 큐브로 계산할 수 없으면 None."""
+    if col in cube["measures"]:
+        return {
+            "SUM": f'SUM("{col}__sum")',
+            "COUNT": f'CAST(SUM("{col}__count") AS BIGINT)',
+            "AVG": f'SUM("{col}__sum") / NULLIF(SUM("{col}__count"), 0)',
+            "MIN": f'MIN("{col}__min")',
+            "MAX": f'MAX("{col}__max")',
+        }.get(func)
+    if col in cube["dimensions"]:
+        # 차원 컬럼은 그룹 값이 그대로 있으므로 건수(라인 수 합계), 고유값 수와 최소/최대만 계산 가능
+        return {
+            "COUNT": f'CAST(COALESCE(SUM("{CUBE_ROWS_COLUMN}") FILTER (WHERE "{col}" IS NOT NULL), 0) AS BIGINT)',
+            "DISTINCT": f'COUNT(DISTINCT "{col}")',
+            "MIN": f'MIN(TRY_CAST("{col}" AS DOUBLE))',
+            "MAX": f'MAX(TRY_CAST("{col}" AS DOUBLE))',
+        }.get(func)
+    return None
+
+
+def _numeric_source(col: str, column_types: dict[str, str] | None) -> str:
+    """
+    숫자 집계(SUM/AVG/MIN/MAX)에 넣을 식.
+    숫자형 컬럼은 그대로, 숫자형 사본 컬럼({컬럼}_숫자형)이 있으면 사본을, 그 외에만 행마다 TRY_CAST.
+    """
+    column_types = column_types or {}
+    if is_numeric_type(column_types.get(col, "")):
+        return f'"{col}"'
+    shadow = f"{col}{NUMERIC_SHADOW_SUFFIX}"
+    if shadow in column_types:
+        return f'"{shadow}"'
+    return f'TRY_CAST("{col}" AS DOUBLE)'
+
+
+def pick_aggregate_cube(
+    columns: list[str],
+    group_by_cols: list[str],
+    agg_functions: dict[str, list[str]],
+    condition: str | None,
+    cubes: list[dict] | None,
+) -> dict | None:
+    """
+    요청을 답할 수 있는 가장 작은 집계 큐브 (GLEngine.aggregate_cubes 항목). 없으면 None (원본 테이블 사용).
+    그룹핑/WHERE 컬럼이 모두 큐브 차원에 있고, 모든 집계가 큐브 값으로 다시 계산 가능해야 합니다.
+    """
+    needed_dims = set(group_by_cols) | _referenced_columns(condition, columns)
+    for cube in sorted(cubes or [], key=lambda c: c["row_count"]):
+        if not needed_dims <= set(cube["dimensions"]):
+            continue
+        if all(
+            _cube_aggregate(col, func.upper(), cube) is not None
+            for col, funcs in agg_functions.items()
+            for func in funcs
+        ):
+            return cube
+    return None
 
 
 def build_aggregation_query(
@@ -11,6 +107,8 @@ def build_aggregation_query(
     agg_functions: dict[str, list[str]],
     condition: str | None,
     having_condition: str | None,
+    cubes: list[dict] | None = None,
+    column_types: dict[str, str] | None = None,
 ) -> str:
     """
     집계 쿼리 생성.
@@ -18,8 +116,12 @@ def build_aggregation_query(
     - agg_functions: {컬럼명: [집계함수들]} 형태 (예: {"차변금액": ["SUM", "COUNT"]})
     - condition: WHERE 절 조건 (집계 전 필터링)
     - having_condition: HAVING 절 조건 (집계 후 필터링)
+    - cubes: 집계 큐브 카탈로그. 요청을 덮는 큐브가 있으면 원본 대신 가장 작은 큐브에서 다시 집계
+    - column_types: {컬럼명: DuckDB 타입}. 숫자형 컬럼은 CAST 없이 집계 (없으면 모든 컬럼을 TRY_CAST)
     """
     base_condition = condition.strip() if condition and condition.strip() else "1=1"
+    cube = pick_aggregate_cube(columns, group_by_cols, agg_functions, condition, cubes)
+    source = f'"{cube["cube_name"]}"' if cube else "general_ledger"
     
     # GROUP BY 절 구성
     group_by_clause = ", ".join(f'"{col}"' for col in group_by_cols) if group_by_cols else ""
@@ -34,20 +136,16 @@ def build_aggregation_query(
     for col, funcs in agg_functions.items():
         for func in funcs:
             func_upper = func.upper()
-            # 숫자형 집계 함수는 TRY_CAST를 사용하여 안전하게 변환 (변환 실패 시 NULL 반환)
-            # COUNT는 타입에 관계없이 사용 가능하므로 CAST 불필요
-            if func_upper == "SUM":
-                # VARCHAR나 다른 타입도 DOUBLE로 변환하여 SUM 가능하도록
-                select_parts.append(f'SUM(TRY_CAST("{col}" AS DOUBLE)) AS "{col}_SUM"')
-            elif func_upper == "COUNT":
+            if cube:
+                select_parts.append(f'{_cube_aggregate(col, func_upper, cube)} AS "{col}_{func_upper}"')
+                continue
+            # COUNT/DISTINCT는 타입에 관계없이 원본 컬럼 그대로, 나머지는 _numeric_source로 필요한 경우에만 변환
+            if func_upper == "COUNT":
                 select_parts.append(f'COUNT("{col}") AS "{col}_COUNT"')
-            elif func_upper == "AVG":
-                select_parts.append(f'AVG(TRY_CAST("{col}" AS DOUBLE)) AS "{col}_AVG"')
-            elif func_upper == "MIN":
-                # MIN/MAX는 문자열도 가능하지만, 숫자형으로 변환하여 일관성 유지
-                select_parts.append(f'MIN(TRY_CAST("{col}" AS DOUBLE)) AS "{col}_MIN"')
-            elif func_upper == "MAX":
-                select_parts.append(f'MAX(TRY_CAST("{col}" AS DOUBLE)) AS "{col}_MAX"')
+            elif func_upper == "DISTINCT":
+                select_parts.append(f'COUNT(DISTINCT "{col}") AS "{col}_DISTINCT"')
+            elif func_upper in ("SUM", "AVG", "MIN", "MAX", "MEDIAN"):
+                select_parts.append(f'{func_upper}({_numeric_source(col, column_types)}) AS "{col}_{func_upper}"')
     
     select_clause = ", ".join(select_parts)
     
@@ -59,7 +157,7 @@ def build_aggregation_query(
     if group_by_clause:
         return f"""
         SELECT {select_clause}
-        FROM general_ledger
+        FROM {source}
         WHERE {base_condition}
         GROUP BY {group_by_clause}{having_clause}
         ORDER BY {group_by_clause}
@@ -71,17 +169,149 @@ def build_aggregation_query(
             # 대신 WHERE 절에 집계 함수를 사용할 수 없으므로 경고
             return f"""
         SELECT {select_clause}
-        FROM general_ledger
+        FROM {source}
         WHERE {base_condition}
         """
         else:
             return f"""
         SELECT {select_clause}
-        FROM general_ledger
+        FROM {source}
         WHERE {base_condition}
         """
 
 
+def build_approx_aggregation_query(
+    group_by_cols: list[str],
+    agg_functions: dict[str, list[str]],
+    condition: str | None,
+    having_condition: str | None,
+    sample_percent: float,
+    column_types: dict[str, str] | None = None,
+    block_sampling: bool = True,
+) -> str:
+    """
+    표본 기반 근사 집계 쿼리 생성 (build_aggregation_query와 같은 결과 컬럼명).
+    - SUM/COUNT는 표본 합계를 표본 비율로 나눈 추정치, AVG는 표본 비율 추정치이며
+      각각 {컬럼}_{함수}_오차 컬럼에 95% 신뢰구간 반폭(±)을 함께 계산
+    - MIN/MAX는 표본 안의 값, MEDIAN은 표본에 approx_quantile 적용
+    - DISTINCT는 표본 안의 고유값 수가 전체보다 크게 작아지므로, 조건에 맞는 전체 행에 approx_count_distinct(HLL) 적용
+      (DISTINCT를 고르면 원장을 한 번 더 읽음)
+    - block_sampling=True면 TABLESAMPLE system(2048행 블록 단위)으로 필요한 블록만 읽고 오차도 블록 단위로 계산.
+      rowid가 없는 Parquet 데이터셋 view는 False로 행 단위 bernoulli 표본 사용 (전체를 읽음)
+    """
+    base_condition = condition.strip() if condition and condition.strip() else "1=1"
+    rate = sample_percent / 100
+    scale = (1 - rate) / (rate * rate)  # 표본 합계 추정치의 분산 = scale × Σ(블록 합계²)
+    groups = [f'"{col}"' for col in group_by_cols]
+
+    sample_parts = list(groups)
+    block_parts: list[str] = []
+    est_parts: list[str] = []
+    sketch_parts: list[str] = []
+    distinct_parts: list[str] = []
+    output: list[str] = []
+    for i, (col, funcs) in enumerate(agg_functions.items()):
+        funcs = [func.upper() for func in funcs]
+        sample_parts += [f'{_numeric_source(col, column_types)} AS "__v{i}"', f'"{col}" AS "__r{i}"']
+        block_parts += [
+            f'COALESCE(SUM("__v{i}"), 0) AS "__s{i}"',
+            f'COUNT("__v{i}") AS "__n{i}"',
+            f'COUNT("__r{i}") AS "__c{i}"',
+            f'MIN("__v{i}") AS "__min{i}"',
+            f'MAX("__v{i}") AS "__max{i}"',
+        ]
+        s, n, c = f'"__s{i}"', f'"__n{i}"', f'"__c{i}"'
+        for func in funcs:
+            name = f"{col}_{func}"
+            error = f"{name}{APPROX_ERROR_SUFFIX}"
+            if func == "SUM":
+                est_parts += [
+                    f'SUM({s}) / {rate} AS "{name}"',
+                    f'{APPROX_Z} * SQRT({scale} * SUM({s} * {s})) AS "{error}"',
+                ]
+            elif func == "COUNT":
+                est_parts += [
+                    f'CAST(ROUND(SUM({c}) / {rate}) AS BIGINT) AS "{name}"',
+                    f'{APPROX_Z} * SQRT({scale} * SUM({c} * {c})) AS "{error}"',
+                ]
+            elif func == "AVG":
+                # 비율 추정치 R = Σs / Σn, 분산 ≈ scale × Σ(s - R·n)² / (Σn / rate)²
+                ratio = f"(SUM({s}) / NULLIF(SUM({n}), 0))"
+                residual = f"SUM({s} * {s}) - 2 * {ratio} * SUM({s} * {n}) + {ratio} * {ratio} * SUM({n} * {n})"
+                est_parts += [
+                    f'{ratio} AS "{name}"',
+                    f'{APPROX_Z} * SQRT({scale} * GREATEST({residual}, 0)) / NULLIF(SUM({n}) / {rate}, 0) AS "{error}"',
+                ]
+            elif func in ("MIN", "MAX"):
+                est_parts.append(f'{func}("__{func.lower()}{i}") AS "{name}"')
+            elif func == "DISTINCT":
+                distinct_parts.append(f'approx_count_distinct("{col}") AS "{name}"')
+            elif func == "MEDIAN":
+                sketch_parts.append(f'approx_quantile("__v{i}", 0.5) AS "{name}"')
+            else:
+                continue
+            output.append(
+                f'distinct_all."{name}"' if func == "DISTINCT"
+                else f'sketch."{name}"' if func == "MEDIAN"
+                else f'est."{name}"'
+            )
+            if func in ("SUM", "COUNT", "AVG"):
+                output.append(f'est."{error}"')
+
+    block = f"rowid // {SAMPLE_BLOCK_ROWS}" if block_sampling else "row_number() OVER ()"
+    source = f"general_ledger TABLESAMPLE {sample_percent}% ({'system' if block_sampling else 'bernoulli'})"
+    group_list = ", ".join(groups)
+    group_by = f"GROUP BY {group_list}" if groups else ""
+
+    ctes = [
+        f"""sample AS MATERIALIZED (
+            SELECT {", ".join(sample_parts)}, {block} AS "__block"
+            FROM {source}
+            WHERE {base_condition}
+        )""",
+        f"""blocks AS (
+            SELECT {", ".join([*groups, *block_parts])}
+            FROM sample
+            GROUP BY {", ".join([*groups, '"__block"'])}
+        )""",
+        f"""est AS (
+            SELECT {", ".join([*groups, *est_parts]) if est_parts or groups else "COUNT(*) AS __one"}
+            FROM blocks
+            {group_by}
+        )""",
+    ]
+    joins: list[str] = []
+    if sketch_parts:
+        ctes.append(f"""sketch AS (
+            SELECT {", ".join([*groups, *sketch_parts])}
+            FROM sample
+            {group_by}
+        )""")
+        on = " AND ".join(f"est.{g} IS NOT DISTINCT FROM sketch.{g}" for g in groups)
+        joins.append(f"JOIN sketch ON {on}" if groups else "CROSS JOIN sketch")
+    if distinct_parts:
+        # 표본에 나온 그룹에만 붙이므로 LEFT JOIN
+        ctes.append(f"""distinct_all AS (
+            SELECT {", ".join([*groups, *distinct_parts])}
+            FROM general_ledger
+            WHERE {base_condition}
+            {group_by}
+        )""")
+        on = " AND ".join(f"est.{g} IS NOT DISTINCT FROM distinct_all.{g}" for g in groups)
+        joins.append(f"LEFT JOIN distinct_all ON {on}" if groups else "CROSS JOIN distinct_all")
+
+    where = f"\n        WHERE {having_condition.strip()}" if having_condition and having_condition.strip() else ""
+    order = f"\n        ORDER BY {group_list}" if groups else ""
+    select = ", ".join([*(f"est.{g}" for g in groups), *output])
+    return f"""
+        WITH {", ".join(ctes)}
+        SELECT * FROM (
+            SELECT {select}
+            FROM est {" ".join(joins)}
+        ){where}{order}
+        """
+
+
 def render_aggregation_tab(engine: GLEngine, columns: list[str]) -> None:
     """집계 데이터 탭 렌더링."""
     st.header("집계 데이터 생성")
@@ -111,11 +341,22 @@ def render_aggregation_tab(engine: GLEngine, columns: list[str]) -> None:
                 for col in agg_target_cols:
                     selected_funcs = st.multiselect(
                         f'"{col}"에 적용할 집계 함수',
-                        options=["SUM", "COUNT", "AVG", "MIN", "MAX"],
+                        options=AGG_FUNCTIONS,
                         key=f"agg_func_{col}",
                     )
                     if selected_funcs:
                         agg_functions[col] = selected_funcs
+                column_types = engine.column_types()
+                cast_cols = [
+                    col for col in agg_target_cols
+                    if set(agg_functions.get(col, [])) - {"COUNT"}
+                    and _numeric_source(col, column_types).startswith("TRY_CAST")
+                ]
+                if cast_cols:
+                    st.caption(
+                        f"💡 {', '.join(cast_cols)}: 숫자형이 아니라 행마다 변환하여 집계합니다. "
+                        "`GLEngine().add_numeric_shadow_column(컬럼명)`으로 숫자형 사본 컬럼을 만들면 빨라집니다."
+                    )
             
             st.markdown("---")
             st.header("필터 조건 (선택사항)")
@@ -194,6 +435,22 @@ def render_aggregation_tab(engine: GLEngine, columns: list[str]) -> None:
                 unsafe_allow_html=True,
             )
             
+            st.markdown("---")
+            st.markdown("**근사 집계 (빠른 탐색)**")
+            agg_approx = st.checkbox(
+                "표본으로 근사 집계",
+                key="agg_approx",
+                help="일부 블록만 읽어 SUM/COUNT/AVG 추정치와 95% 오차(_오차 컬럼)를 계산합니다. "
+                "그룹핑이 정해지면 해제하고 정확히 다시 실행하세요. 집계 큐브로 답할 수 있는 요청은 큐브로 정확히 집계합니다.",
+            )
+            st.select_slider(
+                "표본 비율 (%)",
+                options=APPROX_SAMPLE_PERCENTS,
+                value=5,
+                key="agg_sample_pct",
+                disabled=not agg_approx,
+            )
+
             st.markdown("---")
             run_agg = st.button("집계 실행", type="primary", key="run_agg", use_container_width=True)
     
@@ -205,6 +462,8 @@ def render_aggregation_tab(engine: GLEngine, columns: list[str]) -> None:
         agg_target_cols = st.session_state.get("agg_target_cols", [])
         agg_condition = st.session_state.get("agg_condition", "")
         having_condition = st.session_state.get("having_condition", "")
+        agg_approx = st.session_state.get("agg_approx", False)
+        sample_percent = st.session_state.get("agg_sample_pct", 5)
         
         # 집계 함수 재구성
         agg_functions = {}
@@ -223,20 +482,43 @@ def render_aggregation_tab(engine: GLEngine, columns: list[str]) -> None:
                 if not group_by_cols and having_condition and having_condition.strip():
                     st.warning("HAVING 절은 GROUP BY와 함께 사용해야 합니다. 그룹핑 컬럼을 선택해주세요.")
                 else:
-                    query = build_aggregation_query(columns, group_by_cols, agg_functions, agg_condition, having_condition)
+                    cubes = engine.aggregate_cubes()
+                    column_types = engine.column_types()
+                    cube = pick_aggregate_cube(columns, group_by_cols, agg_functions, agg_condition, cubes)
+                    if agg_approx and not cube:
+                        # Parquet 데이터셋 view에는 rowid가 없어 블록 표본 대신 행 단위 표본 사용
+                        query = build_approx_aggregation_query(
+                            group_by_cols, agg_functions, agg_condition, having_condition, sample_percent,
+                            column_types, block_sampling=engine.dataset_path is None,
+                        )
+                        agg_source = f"🎲 general_ledger {sample_percent}% 표본 근사"
+                    else:
+                        query = build_aggregation_query(
+                            columns, group_by_cols, agg_functions, agg_condition, having_condition, cubes,
+                            column_types,
+                        )
+                        agg_source = (
+                            f"🧊 집계 큐브 {cube['cube_name']} ({cube['row_count']:,}행)" if cube else "📄 원본 general_ledger"
+                        )
                     # 쿼리 저장
                     st.session_state["agg_query_executed"] = query
-                    with st.spinner("집계 쿼리 실행 중..."):
-                        df_agg = engine.run_query(query)
+                    df_agg = run_cancellable(
+                        lambda **control: engine.run_query_result(query, **control),
+                        "집계 쿼리 실행 중...", key="agg_cancel",
+                    )
                     
-                    if df_agg.empty:
+                    if df_agg.num_rows == 0:
                         st.warning("집계 결과가 없습니다.")
                         st.session_state["agg_result"] = None
                         st.session_state["agg_result_info"] = "집계 결과가 없습니다."
                     else:
-                        # 결과 저장
+                        # 결과 저장 (큰 결과는 임시 파일 핸들만 보관)
                         st.session_state["agg_result"] = df_agg
-                        st.session_state["agg_result_info"] = f"집계 완료: {len(df_agg):,}행"
+                        st.session_state.pop("agg_result_page", None)
+                        st.session_state["agg_result_info"] = (
+                            f"{'근사 ' if agg_approx and not cube else ''}집계 완료: {df_agg.num_rows:,}행 · "
+                            f"출처: {agg_source} · {format_query_profile(engine.last_query_profile())}"
+                        )
                         
             except Exception as exc:
                 st.error(f"집계 실행 실패: {exc}")
@@ -250,6 +532,9 @@ def render_aggregation_tab(engine: GLEngine, columns: list[str]) -> None:
                 with st.expander("오류 상세 정보"):
                     st.exception(exc)
     
+    if was_cancelled("agg_cancel"):
+        st.info("⏹ 집계 쿼리를 취소했습니다.")
+
     # 저장된 결과가 있으면 표시 (집계 실행 버튼을 누르지 않아도 유지)
     if "agg_result" in st.session_state and st.session_state["agg_result"] is not None:
         df_agg = st.session_state["agg_result"]
@@ -262,32 +547,27 @@ def render_aggregation_tab(engine: GLEngine, columns: list[str]) -> None:
         
         if result_info:
             st.success(result_info)
-        
-        # 결과 크기 체크 (메모리 사용량)
-        result_memory_mb = df_agg.memory_usage(deep=True).sum() / 1024 / 1024
-        MAX_DISPLAY_SIZE_MB = 200  # 200MB 이상이면 일부만 표시
-        
-        if result_memory_mb > MAX_DISPLAY_SIZE_MB:
-            st.warning(
-                f"⚠️ 결과 크기가 {result_memory_mb:.1f}MB로 큽니다. "
-                f"화면에는 처음 100,000행만 표시되며, 전체 데이터는 CSV 다운로드를 이용해주세요."
+        if result_info.startswith("근사"):
+            st.caption(
+                f"SUM/COUNT/AVG는 표본으로 추정한 값이며 `{APPROX_ERROR_SUFFIX}` 컬럼은 95% 신뢰구간 반폭(±)입니다. "
+                "MIN/MAX/MEDIAN은 표본 안에서 계산한 값이며, DISTINCT는 조건에 맞는 전체 행의 근사 고유값 수입니다."
             )
-            # 처음 100,000행만 표시
-            display_result = df_agg.head(100000)
-            st.dataframe(display_result, use_container_width=True, hide_index=True)
-            st.info(f"전체 {len(df_agg):,}행 중 처음 100,000행만 표시됩니다.")
+        
+        if is_large_result(df_agg):
+            render_large_result(df_agg, key="agg_result_page")
         else:
             st.dataframe(df_agg, use_container_width=True, hide_index=True)
-        
-        # CSV 다운로드
-        csv_agg = df_agg.to_csv(index=False).encode("utf-8-sig")
-        st.download_button(
-            label="집계 결과 CSV 다운로드 (전체 데이터)",
-            data=csv_agg,
-            file_name="general_ledger_aggregated.csv",
-            mime="text/csv",
-            key="download_agg",
-        )
+            # CSV 다운로드 (큰 결과는 메모리에 CSV를 한 번 더 만들지 않도록 파일 내보내기만 제공)
+            st.download_button(
+                label="집계 결과 CSV 다운로드 (전체 데이터)",
+                data=csv_bytes(df_agg),
+                file_name="general_ledger_aggregated.csv",
+                mime="text/csv",
+                key="download_agg",
+            )
+
+        if "agg_query_executed" in st.session_state:
+            render_export_controls(engine, st.session_state["agg_query_executed"], "general_ledger_aggregated", "agg_export")
     elif "agg_result" in st.session_state and st.session_state["agg_result"] is None:
         # 빈 결과 메시지 표시
         info = st.session_state.get("agg_result_info", "")
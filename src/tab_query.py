@@ -1,51 +1,126 @@
 from __future__ import annotations
 
+import math
+
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import streamlit as st
 
-from db_engine import GLEngine
-from journal_entry_analyzer import JournalEntryAnalyzer
+from db_engine import JE_HEADER_KEY, JE_HEADER_TABLE, PAGE_KEY_COLUMNS, GLEngine
+from query_control import (
+    format_query_profile,
+    is_large_result,
+    render_export_controls,
+    render_large_result,
+    run_cancellable,
+    was_cancelled,
+)
+from query_cache import SpilledResult
+from result_export import csv_bytes, numeric_column_sums
+from trx_hash import HASH_COLUMN
 
 
 def build_duckdb_query(
     columns: list[str],
     condition: str | None,
     expand_full_entry: bool,
-    limit: int,
+    limit: int | None,
     je_col: str | None,
+    header_condition: str | None = None,
+    hash_col: str | None = None,
+    use_je_header: bool = False,
 ) -> str:
     """
-    Step1 + Step2 를 DuckDB에서 처리하기 위한 쿼리 생성.
+    Step1 + Step2 + Step3 를 DuckDB에서 처리하기 위한 쿼리 생성.
     - condition 은 사용자 입력 SQL 조각 (DuckDB 호환)으로 간주.
+    - header_condition 은 je_header(전표당 1행) 컬럼에 대한 전표 단위 조건. 라인 대신 요약 테이블에서 대상 전표를 고름.
     - expand_full_entry=True면 조건에 걸린 전표번호 전체 라인을 반환.
+    - hash_col을 주면 Step3 (expand_full_entry=True 필요): 거래유형(hash_col)별로 가장 작은 전표번호 하나의 라인만 남김
+      (해시가 없는 라인은 유지).
+      대표 전표는 (전표, 해시) 키만으로 고른 뒤 그 전표의 라인만 다시 읽습니다.
+      use_je_header=True이고 Step2 + 기본 컬럼(전표번호, 거래유형그룹_해시값)이면 키를 je_header에서 읽음.
+    - limit은 Step3까지 적용한 뒤 마지막에 적용하며, None이면 LIMIT 없이 생성 (페이지 단위 조회용).
     """
     base_condition = condition.strip() if condition and condition.strip() else "1=1"
+    header_condition = header_condition.strip() if header_condition and header_condition.strip() else None
+    limit_clause = f"LIMIT {limit}" if limit is not None else ""
+    header_targets = (
+        f'SELECT "{JE_HEADER_KEY}" FROM {JE_HEADER_TABLE} WHERE ({header_condition})' if header_condition else None
+    )
+    if hash_col and not (expand_full_entry and je_col):
+        raise ValueError("Step3를 사용하려면 Step2를 먼저 활성화하고 전표 식별 컬럼을 선택하세요.")
 
-    if expand_full_entry:
-        if not je_col:
-            raise ValueError("전표 식별 컬럼을 선택하세요.")
+    if not expand_full_entry:
+        if header_targets:
+            base_condition = f'({base_condition}) AND "{JE_HEADER_KEY}" IN ({header_targets})'
+        return f"""
+        SELECT *
+        FROM general_ledger
+        WHERE {base_condition}
+        {limit_clause}
+        """
+
+    if not je_col:
+        raise ValueError("전표 식별 컬럼을 선택하세요.")
+    if header_targets:
+        if je_col != JE_HEADER_KEY:
+            raise ValueError(f"전표 단위 조건은 전표 식별 컬럼이 '{JE_HEADER_KEY}'일 때만 사용할 수 있습니다.")
+        # 대상 전표는 je_header에서 고르고, 라인 조건이 있으면 그 조건에 걸린 전표로 좁힘
+        line_filter = (
+            f' AND "{je_col}" IN (SELECT "{je_col}" FROM general_ledger WHERE {base_condition})'
+            if base_condition != "1=1" else ""
+        )
+        target = header_targets + line_filter
+    else:
+        target = f"""
+        SELECT DISTINCT "{je_col}"
+        FROM general_ledger
+        WHERE {base_condition}
+        """
+    if not hash_col:
         return f"""
         WITH target AS (
-            SELECT DISTINCT "{je_col}"
-            FROM general_ledger
-            WHERE {base_condition}
+            {target}
         )
         SELECT gl.*
         FROM general_ledger AS gl
         JOIN target USING ("{je_col}")
-        LIMIT {limit}
+        {limit_clause}
         """
+
+    # Step3: 대표 전표의 모든 라인 + 해시가 없는 대상 전표 라인
+    step_filter = f'"{je_col}" IN (SELECT "{je_col}" FROM target)'
+    if use_je_header and je_col == JE_HEADER_KEY and hash_col == HASH_COLUMN:
+        # 전표당 1행인 je_header에서 대상 전표의 해시를 읽음 (라인을 스캔하지 않음)
+        keys = f'SELECT "{je_col}", "{hash_col}" FROM {JE_HEADER_TABLE} WHERE {step_filter}'
     else:
-        return f"""
-        SELECT *
-        FROM general_ledger
-        WHERE {base_condition}
-        LIMIT {limit}
+        keys = f'SELECT DISTINCT "{je_col}", "{hash_col}" FROM general_ledger WHERE {step_filter}'
+    return f"""
+        WITH target AS (
+            {target}
+        ),
+        reps AS (
+            SELECT "{je_col}"
+            FROM ({keys}) AS keys
+            WHERE "{hash_col}" IS NOT NULL
+            QUALIFY row_number() OVER (PARTITION BY "{hash_col}" ORDER BY "{je_col}") = 1
+        )
+        SELECT * FROM general_ledger
+        WHERE "{je_col}" IN (SELECT "{je_col}" FROM reps)
+        UNION ALL
+        SELECT * FROM general_ledger
+        WHERE "{hash_col}" IS NULL AND {step_filter}
+        ORDER BY "{je_col}"
+        {limit_clause}
         """
 
 
 def render_query_tab(engine: GLEngine, columns: list[str]) -> None:
     """데이터 조회 탭 렌더링."""
+    has_header = engine.has_je_header()
+    header_condition = st.session_state.get("header_condition") if has_header else None
+
     with st.sidebar.expander("🔍 데이터 조회 설정", expanded=True):
             st.header("Step1: 조건 입력")
             condition = st.text_area(
@@ -85,6 +160,18 @@ def render_query_tab(engine: GLEngine, columns: list[str]) -> None:
                 """,
                 unsafe_allow_html=True,
             )
+
+            if has_header:
+                st.text_input(
+                    "전표 단위 조건 (선택)",
+                    placeholder="예: 차대일치 = false OR 라인수 >= 20",
+                    key="header_condition",
+                    help=(
+                        f"{JE_HEADER_TABLE}(전표당 1행) 컬럼으로 전표를 고릅니다: "
+                        "회계월, 라인수, 차변합계, 대변합계, 차대일치, 계정과목목록, 거래유형그룹_해시값, 최초전기일자. "
+                        "라인 조건과 함께 쓰면 두 조건을 모두 만족하는 전표만 남습니다."
+                    ),
+                )
             
             st.markdown("---")
             st.header("Step2: 전표 확장 설정")
@@ -115,9 +202,19 @@ def render_query_tab(engine: GLEngine, columns: list[str]) -> None:
                     key="hash_col",
                 )
 
-            limit = st.slider(
-                "조회 최대 행 수 (DB LIMIT)", min_value=1000, max_value=1000000, value=50000, step=1000, key="query_limit"
+            st.markdown("---")
+            paged = st.checkbox(
+                "페이지 단위 조회",
+                value=False,
+                key="query_paged",
+                help="필터 결과를 DuckDB에 둔 채 전표번호·전표행번 순서로 한 페이지씩 가져옵니다. 전체 행 수는 따로 계산합니다.",
             )
+            if paged:
+                st.selectbox("페이지당 행 수", options=[500, 1000, 5000, 10000], index=1, key="query_page_size")
+            else:
+                limit = st.slider(
+                    "조회 최대 행 수 (DB LIMIT)", min_value=1000, max_value=1000000, value=50000, step=1000, key="query_limit"
+                )
 
             st.markdown("---")
             run = st.button("실행 (Step1→2→3)", key="run_query", use_container_width=True)
@@ -126,7 +223,12 @@ def render_query_tab(engine: GLEngine, columns: list[str]) -> None:
     run = st.session_state.get("run_query", False)
     
     # 조회 버튼이 눌렸을 때만 새로 조회하고 결과를 저장
-    if run:
+    if run and st.session_state.get("query_paged", False):
+        _start_paged_query(columns, header_condition, has_header)
+    elif run:
+        # 일반 조회로 바꾸면 이전 페이지 조회 상태는 제거
+        st.session_state.pop("query_pages", None)
+        st.session_state.pop("query_summary", None)
         # session_state에서 변수 가져오기
         condition = st.session_state.get("query_condition", "")
         expand_full = st.session_state.get("expand_full", False)
@@ -135,9 +237,16 @@ def render_query_tab(engine: GLEngine, columns: list[str]) -> None:
         je_col = st.session_state.get("je_col") if expand_full else None
         hash_col = st.session_state.get("hash_col") if unique_only else None
         try:
-            query = build_duckdb_query(columns, condition, expand_full, limit, je_col)
-            # 쿼리 저장
+            if unique_only and not hash_col:
+                raise ValueError("거래유형 해시 컬럼을 선택하세요.")
+            query = build_duckdb_query(
+                columns, condition, expand_full, limit, je_col, header_condition, hash_col, has_header
+            )
+            # 쿼리 저장 (파일 내보내기는 LIMIT 없는 쿼리로 전체 결과를 씀)
             st.session_state["query_executed"] = query
+            st.session_state["query_export"] = build_duckdb_query(
+                columns, condition, expand_full, None, je_col, header_condition, hash_col, has_header
+            )
         except Exception as exc:
             st.error(f"쿼리 준비 실패: {exc}")
             # 오류 발생 시 기존 결과도 초기화
@@ -148,52 +257,58 @@ def render_query_tab(engine: GLEngine, columns: list[str]) -> None:
             if "query_executed" in st.session_state:
                 del st.session_state["query_executed"]
         else:
-            with st.spinner("쿼리 실행 중..."):
-                try:
-                    df = engine.run_query(query)
-                except Exception as exc:
-                    st.error(f"쿼리 실행 실패: {exc}")
-                    # 오류 발생 시 기존 결과도 초기화
-                    if "query_result" in st.session_state:
-                        del st.session_state["query_result"]
-                    if "query_result_info" in st.session_state:
-                        del st.session_state["query_result_info"]
-                    if "query_executed" in st.session_state:
-                        del st.session_state["query_executed"]
+            try:
+                table = run_cancellable(
+                    lambda **control: engine.run_query_result(query, **control),
+                    "쿼리 실행 중...", key="query_cancel",
+                )
+            except Exception as exc:
+                st.error(f"쿼리 실행 실패: {exc}")
+                # 오류 발생 시 기존 결과도 초기화
+                if "query_result" in st.session_state:
+                    del st.session_state["query_result"]
+                if "query_result_info" in st.session_state:
+                    del st.session_state["query_result_info"]
+                if "query_executed" in st.session_state:
+                    del st.session_state["query_executed"]
+            else:
+                query_profile = format_query_profile(engine.last_query_profile())
+                if table.num_rows == 0:
+                    st.warning("조건에 맞는 데이터가 없습니다.")
+                    # 빈 결과도 저장
+                    st.session_state["query_result"] = None
+                    st.session_state["query_result_info"] = "조건에 맞는 데이터가 없습니다."
                 else:
-                    if df.empty:
-                        st.warning("조건에 맞는 데이터가 없습니다.")
-                        # 빈 결과도 저장
-                        st.session_state["query_result"] = None
-                        st.session_state["query_result_info"] = "조건에 맞는 데이터가 없습니다."
+                    # 결과 저장 (큰 결과는 임시 파일 핸들만 보관)
+                    st.session_state["query_result"] = table
+                    st.session_state.pop("query_result_page", None)
+                    if unique_only:
+                        pattern_count = _count_distinct(table, hash_col)
+                        st.session_state["query_result_info"] = (
+                            f"Step3 적용 후 {table.num_rows:,}행 (거래유형 {pattern_count:,}개, 표시 최대 {limit:,}행) · {query_profile}"
+                        )
                     else:
-                        result = df
-                        if unique_only:
-                            if not hash_col:
-                                st.error("거래유형 해시 컬럼을 선택하세요.")
-                                st.session_state["query_result"] = None
-                                st.session_state["query_result_info"] = None
-                            elif not je_col:
-                                st.error("Step3를 사용하려면 Step2를 먼저 활성화하고 전표 식별 컬럼을 선택하세요.")
-                                st.session_state["query_result"] = None
-                                st.session_state["query_result_info"] = None
-                            else:
-                                # Analyzer는 전표번호 / 거래유형그룹_해시값 명칭을 기대하므로 임시 매핑
-                                mapped_df = df.rename(columns={je_col: "전표번호", hash_col: "거래유형그룹_해시값"})
-                                analyzer = JournalEntryAnalyzer(mapped_df)
-                                result_mapped = analyzer.unique_representative(mapped_df, unique_pattern_only=True)
-                                # 출력 시 원본 컬럼명으로 복원
-                                result = result_mapped.rename(columns={"전표번호": je_col, "거래유형그룹_해시값": hash_col})
-                                # 결과 저장
-                                st.session_state["query_result"] = result
-                                st.session_state["query_result_info"] = f"Step1+2 결과 {len(df):,}행 → Step3 적용 후 {len(result):,}행 (표시 최대 {limit:,}행)"
-                        else:
-                            # 결과 저장
-                            st.session_state["query_result"] = result
-                            st.session_state["query_result_info"] = f"Step1+2 결과 {len(df):,}행 → Step3 적용 후 {len(result):,}행 (표시 최대 {limit:,}행)"
-    
+                        st.session_state["query_result_info"] = (
+                            f"Step1+2 결과 {table.num_rows:,}행 (표시 최대 {limit:,}행) · {query_profile}"
+                        )
+                    # 숫자형 컬럼 합계는 LIMIT 없는 쿼리를 DuckDB에서 집계 (표시 제한과 관계없이 전체 결과 기준)
+                    try:
+                        st.session_state["query_summary"] = run_cancellable(
+                            lambda **control: engine.numeric_summary(st.session_state["query_export"], **control),
+                            "숫자형 컬럼 합계 계산 중...", key="query_summary_cancel",
+                        )
+                    except Exception as exc:
+                        st.warning(f"전체 결과 합계 계산 실패 (조회된 결과 기준으로 표시합니다): {exc}")
+
+    if was_cancelled("query_cancel"):
+        st.info("⏹ 쿼리를 취소했습니다.")
+    if was_cancelled("query_summary_cancel"):
+        st.info("⏹ 전체 결과 합계 계산을 취소했습니다. 합계는 조회된 결과 기준으로 표시합니다.")
+
     # 저장된 결과가 있으면 표시 (조회 버튼을 누르지 않아도 유지)
-    if "query_result" in st.session_state and st.session_state["query_result"] is not None:
+    if "query_pages" in st.session_state:
+        _render_paged_result(engine)
+    elif "query_result" in st.session_state and st.session_state["query_result"] is not None:
         result = st.session_state["query_result"]
         result_info = st.session_state.get("query_result_info", "")
         
@@ -202,63 +317,42 @@ def render_query_tab(engine: GLEngine, columns: list[str]) -> None:
             with st.expander("실행된 쿼리 보기", expanded=False):
                 st.code(st.session_state["query_executed"], language="sql")
         
-        # 숫자형 컬럼 합계 계산 및 표시
-        numeric_cols = result.select_dtypes(include=[pd.Int64Dtype(), pd.Float64Dtype(), 'int64', 'float64', 'int32', 'float32']).columns.tolist()
-        if numeric_cols:
+        # 숫자형 컬럼 합계 표시 (DuckDB 전체 결과 집계, 계산하지 못했으면 조회된 결과를 Arrow compute로 합계)
+        summary = st.session_state.get("query_summary")
+        if summary is not None:
+            summary_data = [
+                {key: _format_number(value) if key != "컬럼명" else value for key, value in row.items()}
+                for row in summary
+            ]
+            summary_note = "표시 제한(LIMIT)과 관계없이 조건에 맞는 전체 결과의 숫자형 컬럼 합계입니다."
+        else:
+            summary_data = numeric_column_sums(result)
+            summary_note = "조회된 데이터(표시 제한 적용)의 숫자형 컬럼 합계입니다."
+        if summary_data:
             st.markdown("### 📊 숫자형 컬럼 합계")
-            st.markdown("조회된 데이터의 숫자형 컬럼 합계입니다.")
-            
-            # 각 숫자형 컬럼의 합계 계산
-            summary_data = []
-            for col in numeric_cols:
-                try:
-                    col_sum = result[col].sum()
-                    # NaN이 아닌 값의 개수
-                    non_null_count = result[col].notna().sum()
-                    summary_data.append({
-                        "컬럼명": col,
-                        "합계": f"{col_sum:,.0f}" if pd.notna(col_sum) and col_sum == int(col_sum) else f"{col_sum:,.2f}",
-                        "유효 행 수": f"{non_null_count:,}",
-                    })
-                except Exception:
-                    # 합계 계산 실패 시 스킵
-                    continue
-            
-            if summary_data:
-                summary_df = pd.DataFrame(summary_data)
-                st.dataframe(summary_df, use_container_width=True, hide_index=True)
-            else:
-                st.info("합계를 계산할 수 있는 숫자형 컬럼이 없습니다.")
+            st.markdown(summary_note)
+            summary_df = pd.DataFrame(summary_data)
+            st.dataframe(summary_df, use_container_width=True, hide_index=True)
         else:
             st.info("합계를 계산할 수 있는 숫자형 컬럼이 없습니다.")
         
         if result_info:
             st.success(result_info)
         
-        # 결과 크기 체크 (메모리 사용량)
-        result_memory_mb = result.memory_usage(deep=True).sum() / 1024 / 1024
-        MAX_DISPLAY_SIZE_MB = 200  # 200MB 이상이면 일부만 표시
-        
-        if result_memory_mb > MAX_DISPLAY_SIZE_MB:
-            st.warning(
-                f"⚠️ 결과 크기가 {result_memory_mb:.1f}MB로 큽니다. "
-                f"화면에는 처음 100,000행만 표시되며, 전체 데이터는 CSV 다운로드를 이용해주세요."
-            )
-            # 처음 100,000행만 표시
-            display_result = result.head(100000)
-            st.dataframe(display_result, use_container_width=True, hide_index=True)
-            st.info(f"전체 {len(result):,}행 중 처음 100,000행만 표시됩니다.")
+        if is_large_result(result):
+            render_large_result(result, key="query_result_page")
         else:
             st.dataframe(result, use_container_width=True, hide_index=True)
+            st.download_button(
+                label="CSV 다운로드 (조회된 결과)",
+                data=csv_bytes(result),
+                file_name="general_ledger_filtered.csv",
+                mime="text/csv",
+                key="csv_download_query",  # 고유 키로 변경하여 다운로드 버튼이 결과를 사라지게 하지 않도록
+            )
 
-        csv = result.to_csv(index=False).encode("utf-8-sig")
-        st.download_button(
-            label="CSV 다운로드 (전체 데이터)",
-            data=csv,
-            file_name="general_ledger_filtered.csv",
-            mime="text/csv",
-            key="csv_download_query",  # 고유 키로 변경하여 다운로드 버튼이 결과를 사라지게 하지 않도록
-        )
+        if "query_export" in st.session_state:
+            render_export_controls(engine, st.session_state["query_export"], "general_ledger_filtered", "query_export")
     elif "query_result" in st.session_state and st.session_state["query_result"] is None:
         # 빈 결과 메시지 표시
         info = st.session_state.get("query_result_info", "")
@@ -266,3 +360,133 @@ def render_query_tab(engine: GLEngine, columns: list[str]) -> None:
             st.warning(info)
     elif not run:
         st.info("좌측 필터를 설정하고 '실행 (Step1→2→3)'을 눌러주세요.")
+
+
+def _format_number(value: float | int | None) -> str:
+    """합계 표시용 숫자 문자열 (정수면 소수점 없이, 아니면 소수 둘째 자리까지)."""
+    if value is None:
+        return ""
+    if not math.isfinite(value):
+        return str(value)
+    return f"{value:,.0f}" if value == int(value) else f"{value:,.2f}"
+
+
+def _count_distinct(result: pa.Table | SpilledResult, column: str) -> int:
+    """결과의 column 고유값 수 (batch별 고유값만 모아서 계산하므로 파일로 내린 결과도 전체를 올리지 않음)."""
+    uniques = [pc.unique(batch.column(column)) for batch in result.to_batches()]
+    return pc.count_distinct(pa.chunked_array(uniques, result.schema.field(column).type)).as_py()
+
+
+def _start_paged_query(columns: list[str], header_condition: str | None, has_header: bool) -> None:
+    """페이지 단위 조회 시작: LIMIT 없는 쿼리를 만들고 첫 페이지 상태를 session_state에 저장."""
+    st.session_state.pop("query_result", None)
+    st.session_state.pop("query_result_info", None)
+
+    missing = [col for col in PAGE_KEY_COLUMNS if col not in columns]
+    if missing:
+        st.error(f"페이지 단위 조회에는 {', '.join(missing)} 컬럼이 필요합니다.")
+    else:
+        expand_full = st.session_state.get("expand_full", False)
+        unique_only = st.session_state.get("unique_only", False)
+        try:
+            query = build_duckdb_query(
+                columns,
+                st.session_state.get("query_condition", ""),
+                expand_full,
+                None,
+                st.session_state.get("je_col") if expand_full else None,
+                header_condition,
+                st.session_state.get("hash_col") if unique_only else None,
+                has_header,
+            )
+        except Exception as exc:
+            st.error(f"쿼리 준비 실패: {exc}")
+        else:
+            st.session_state["query_executed"] = query
+            # starts: 지금까지 지나온 페이지들의 시작 키 (첫 페이지는 None)
+            st.session_state["query_pages"] = {
+                "query": query,
+                "page_size": st.session_state.get("query_page_size", 1000),
+                "starts": [None],
+            }
+            return
+
+    st.session_state.pop("query_pages", None)
+    st.session_state.pop("query_executed", None)
+
+
+def _move_page(step: int) -> None:
+    """이전/다음 버튼 콜백: 시작 키 목록에 다음 페이지 시작 키를 쌓거나 꺼냄."""
+    pages = st.session_state["query_pages"]
+    if step > 0 and pages.get("next_after") is not None:
+        pages["starts"].append(pages["next_after"])
+    elif step < 0 and len(pages["starts"]) > 1:
+        pages["starts"].pop()
+
+
+def _render_paged_result(engine: GLEngine) -> None:
+    """현재 페이지만 DuckDB에서 가져와 표시하고, 전체 행 수는 COUNT 쿼리로 따로 계산."""
+    pages = st.session_state["query_pages"]
+    page_size = pages["page_size"]
+    page_no = len(pages["starts"])
+
+    with st.expander("실행된 쿼리 보기", expanded=False):
+        st.code(pages["query"], language="sql")
+
+    if was_cancelled("query_page_cancel"):
+        st.info("⏹ 페이지 조회를 취소했습니다. 다시 조회하려면 실행 또는 이전/다음 버튼을 누르세요.")
+        return
+    try:
+        page = run_cancellable(
+            lambda **control: engine.fetch_page(pages["query"], pages["starts"][-1], page_size, **control),
+            "페이지 조회 중...", key="query_page_cancel",
+        )
+        page_profile = format_query_profile(engine.last_query_profile())
+    except Exception as exc:
+        st.error(f"쿼리 실행 실패: {exc}")
+        return
+    if page.num_rows == 0 and page_no == 1:
+        st.warning("조건에 맞는 데이터가 없습니다.")
+        return
+
+    # 이 페이지 마지막 행의 키가 다음 페이지의 시작점
+    pages["next_after"] = tuple(page[col][-1].as_py() for col in PAGE_KEY_COLUMNS) if page.num_rows else None
+
+    col_prev, col_info, col_next = st.columns([1, 4, 1])
+    col_prev.button(
+        "◀ 이전", key="query_page_prev", on_click=_move_page, args=(-1,),
+        disabled=page_no == 1, use_container_width=True,
+    )
+    col_next.button(
+        "다음 ▶", key="query_page_next", on_click=_move_page, args=(1,),
+        disabled=page.num_rows < page_size, use_container_width=True,
+    )
+    st.dataframe(page, use_container_width=True, hide_index=True)
+    st.caption(page_profile)
+
+    # 첫 화면이 먼저 뜨도록 전체 행 수는 페이지 표시 후 계산
+    if was_cancelled("query_count_cancel"):
+        col_info.info("⏹ 전체 행 수 계산을 취소했습니다.")
+        return
+    try:
+        total = run_cancellable(
+            lambda **control: engine.count_rows(pages["query"], **control),
+            "전체 행 수 계산 중...", key="query_count_cancel",
+        )
+    except Exception as exc:
+        col_info.warning(f"전체 행 수 계산 실패: {exc}")
+    else:
+        first_row = (page_no - 1) * page_size + 1
+        col_info.markdown(
+            f"**{page_no:,} / {max(1, math.ceil(total / page_size)):,} 페이지** · "
+            f"전체 {total:,}행 중 {first_row:,}~{first_row + page.num_rows - 1:,}행"
+        )
+
+    st.download_button(
+        label="현재 페이지 CSV 다운로드",
+        data=csv_bytes(page),
+        file_name=f"general_ledger_filtered_p{page_no}.csv",
+        mime="text/csv",
+        key="csv_download_query_page",
+    )
+    render_export_controls(engine, pages["query"], "general_ledger_filtered", "query_export")
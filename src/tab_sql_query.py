@@ -3,6 +3,15 @@ from __future__ import annotations
 import streamlit as st
 
 from db_engine import GLEngine
+from query_control import (
+    format_query_profile,
+    is_large_result,
+    render_export_controls,
+    render_large_result,
+    run_cancellable,
+    was_cancelled,
+)
+from result_export import csv_bytes
 
 
 def render_sql_query_tab(engine: GLEngine, columns: list[str]) -> None:
@@ -72,20 +81,27 @@ def render_sql_query_tab(engine: GLEngine, columns: list[str]) -> None:
                 if "sql_query_result_info" in st.session_state:
                     del st.session_state["sql_query_result_info"]
             else:
-                with st.spinner("SQL 쿼리 실행 중..."):
-                    try:
-                        df = engine.run_query(sql_query)
-                        # 결과 저장
-                        st.session_state["sql_query_result"] = df
-                        st.session_state["sql_query_result_info"] = f"쿼리 실행 완료: {len(df):,}행"
-                    except Exception as exc:
-                        st.error(f"SQL 쿼리 실행 실패: {exc}")
-                        # 오류 발생 시 기존 결과도 초기화
-                        if "sql_query_result" in st.session_state:
-                            del st.session_state["sql_query_result"]
-                        if "sql_query_result_info" in st.session_state:
-                            del st.session_state["sql_query_result_info"]
-    
+                try:
+                    df = run_cancellable(
+                        lambda **control: engine.run_query_result(sql_query, **control),
+                        "SQL 쿼리 실행 중...", key="sql_cancel",
+                    )
+                    # 결과 저장 (큰 결과는 임시 파일 핸들만 보관)
+                    st.session_state["sql_query_result"] = df
+                    st.session_state.pop("sql_result_page", None)
+                    st.session_state["sql_query_executed"] = sql_query
+                    st.session_state["sql_query_result_info"] = f"쿼리 실행 완료: {df.num_rows:,}행 · {format_query_profile(engine.last_query_profile())}"
+                except Exception as exc:
+                    st.error(f"SQL 쿼리 실행 실패: {exc}")
+                    # 오류 발생 시 기존 결과도 초기화
+                    if "sql_query_result" in st.session_state:
+                        del st.session_state["sql_query_result"]
+                    if "sql_query_result_info" in st.session_state:
+                        del st.session_state["sql_query_result_info"]
+
+    if was_cancelled("sql_cancel"):
+        st.info("⏹ 쿼리를 취소했습니다.")
+
     # 저장된 결과가 있으면 표시 (SQL 실행 버튼을 누르지 않아도 유지)
     if "sql_query_result" in st.session_state and st.session_state["sql_query_result"] is not None:
         df = st.session_state["sql_query_result"]
@@ -94,33 +110,23 @@ def render_sql_query_tab(engine: GLEngine, columns: list[str]) -> None:
         if result_info:
             st.success(result_info)
         
-        # 결과 크기 체크 (메모리 사용량)
-        result_memory_mb = df.memory_usage(deep=True).sum() / 1024 / 1024
-        MAX_DISPLAY_SIZE_MB = 200  # 200MB 이상이면 일부만 표시
-        
-        if result_memory_mb > MAX_DISPLAY_SIZE_MB:
-            st.warning(
-                f"⚠️ 결과 크기가 {result_memory_mb:.1f}MB로 큽니다. "
-                f"화면에는 처음 100,000행만 표시되며, 전체 데이터는 CSV 다운로드를 이용해주세요."
-            )
-            # 처음 100,000행만 표시
-            display_result = df.head(100000)
-            st.dataframe(display_result, use_container_width=True, hide_index=True)
-            st.info(f"전체 {len(df):,}행 중 처음 100,000행만 표시됩니다.")
+        if is_large_result(df):
+            render_large_result(df, key="sql_result_page")
         else:
             st.dataframe(df, use_container_width=True, hide_index=True)
+            st.download_button(
+                label="CSV 다운로드 (전체 데이터)",
+                data=csv_bytes(df),
+                file_name="sql_query_result.csv",
+                mime="text/csv",
+                key="csv_download_sql",
+            )
 
-        csv = df.to_csv(index=False).encode("utf-8-sig")
-        st.download_button(
-            label="CSV 다운로드 (전체 데이터)",
-            data=csv,
-            file_name="sql_query_result.csv",
-            mime="text/csv",
-            key="csv_download_sql",
-        )
+        executed_query = st.session_state.get("sql_query_executed", st.session_state.get("sql_query", ""))
+        render_export_controls(engine, executed_query, "sql_query_result", "sql_export")
         
         # 쿼리 미리보기
         with st.expander("실행된 쿼리 보기"):
-            st.code(st.session_state.get("sql_query", ""), language="sql")
+            st.code(executed_query, language="sql")
     elif not run_sql:
         st.info("좌측 사이드바에서 SQL 쿼리를 입력하고 'SQL 실행' 버튼을 눌러주세요.")
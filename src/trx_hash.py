@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import hashlib
+import sys
+import time
+from typing import Literal
+
+import duckdb
+import pandas as pd
+
+HASH_COLUMN = "거래유형그룹_해시값"
+
+# Python str.strip()이 제거하는 공백 문자 전체를 RE2 문자 클래스로 표현 (DuckDB에서 동일하게 정규화)
+_PY_WHITESPACE_CLASS = "[" + "".join(
+    f"\\x{{{c:x}}}" for c in range(sys.maxunicode + 1) if chr(c).isspace()
+) + "]"
+
+
+def generate_trx_group_hash(group: pd.DataFrame, coa_col: str, max_len: int = 10) -> str:
+    """
+    노트북(csv_data_normalizaion.ipynb)의 원래 구현. groupby().apply()용.
+    벡터화 구현의 결과 검증과 벤치마크 기준으로 유지합니다.
+    """
+    def normalize(v, max_len=max_len):
+        if pd.isna(v) or str(v).strip() == "0":
+            return None
+
+        s = str(v).strip().replace(",", "").replace(".", "")  # 쉼표와 점 제거
+
+        # 앞에서부터 max_len 자리까지만 사용
+        s = s[:max_len]
+
+        return s
+
+    combo = sorted({normalize(v) for v in group[coa_col] if normalize(v)})
+    combo_str = "|".join(combo)
+    return hashlib.md5(combo_str.encode("utf-8")).hexdigest()
+
+
+def normalize_coa_codes(codes: pd.Series, max_len: int = 10) -> pd.Series:
+    """
+    계정과목코드 정규화 (벡터 연산).
+    NULL, '0', 정규화 후 빈 문자열은 NULL로 반환. 나머지는 공백 제거 → 쉼표/점 제거 → 앞 max_len자리.
+    """
+    text = codes[codes.notna()].astype(str).str.strip()
+    normalized = (
+        text.str.replace(",", "", regex=False)
+        .str.replace(".", "", regex=False)
+        .str[:max_len]
+    )
+    normalized = normalized[(text != "0") & (normalized != "")]
+    return normalized.reindex(codes.index)
+
+
+def trx_group_hash_sql(source: str, je_col: str = "전표번호", coa_col: str = "계정과목코드", max_len: int = 10) -> str:
+    """
+    DuckDB에서 전표번호별 거래유형 해시를 계산하는 SQL 생성 (결과 컬럼: je_col, 거래유형그룹_해시값).
+    source는 테이블/뷰 이름 또는 괄호로 감싼 서브쿼리. 계정과목코드는 문자열 컬럼이어야 합니다.
+    """
+    strip_pattern = f"'^{_PY_WHITESPACE_CLASS}+|{_PY_WHITESPACE_CLASS}+$'"
+    return f"""
+        WITH codes AS (
+            SELECT
+                "{je_col}" AS je,
+                regexp_replace("{coa_col}", {strip_pattern}, '', 'g') AS stripped,
+                left(replace(replace(stripped, ',', ''), '.', ''), {int(max_len)}) AS code
+            FROM {source}
+            WHERE "{je_col}" IS NOT NULL
+        )
+        SELECT
+            je AS "{je_col}",
+            md5(COALESCE(
+                string_agg(DISTINCT code, '|' ORDER BY code) FILTER (WHERE stripped <> '0' AND code <> ''),
+                ''
+            )) AS "{HASH_COLUMN}"
+        FROM codes
+        GROUP BY je
+    """
+
+
+def trx_group_hashes(
+    df: pd.DataFrame,
+    je_col: str = "전표번호",
+    coa_col: str = "계정과목코드",
+    engine: Literal["pandas", "duckdb"] = "pandas",
+) -> pd.Series:
+    """
+    전표번호별 거래유형 해시를 계산하여 전표번호를 index로 하는 Series로 반환.
+    노트북의 df.groupby(je_col).apply(generate_trx_group_hash)와 같은 값을 반환합니다.
+
+    Parameters
+    ----------
+    engine: {"pandas", "duckdb"}, default "pandas"
+        "pandas"는 정규화/중복 제거/정렬/문자열 연결을 벡터 연산으로 처리하고 전표당 md5 1회만 계산.
+        "duckdb"는 정규화부터 md5까지 DuckDB SQL(string_agg + md5)로 처리.
+    """
+    keys = df[je_col]
+
+    if engine == "duckdb":
+        # 계정과목코드를 Python str()과 같은 규칙으로 문자열화한 뒤 DuckDB로 전달
+        codes = df[coa_col]
+        frame = pd.DataFrame({
+            "je": keys,
+            "coa": codes.where(codes.isna(), codes.astype(str)).astype(object),
+        })
+        conn = duckdb.connect()
+        try:
+            conn.register("trx_codes", frame)
+            result = conn.execute(trx_group_hash_sql("trx_codes", "je", "coa")).df()
+        finally:
+            conn.close()
+        hashes = pd.Series(result[HASH_COLUMN].to_numpy(), index=result["je"].to_numpy(), name=HASH_COLUMN)
+        return hashes.reindex(pd.unique(keys.dropna()))
+
+    if engine != "pandas":
+        raise ValueError(f"지원하지 않는 engine입니다: {engine}")
+
+    pairs = pd.DataFrame({"je": keys, "code": normalize_coa_codes(df[coa_col])})
+    pairs = pairs.dropna().drop_duplicates().sort_values(["je", "code"])
+    # agg("|".join)은 전표마다 Python 함수를 호출하므로, 구분자를 붙여 문자열 합계(cython)로 연결한 뒤 끝의 '|'를 제거
+    combos = (pairs["code"] + "|").groupby(pairs["je"], sort=False).sum().str[:-1]
+    combos = combos.reindex(pd.unique(keys.dropna()), fill_value="")
+    return combos.map(lambda s: hashlib.md5(s.encode("utf-8")).hexdigest()).rename(HASH_COLUMN)
+
+
+def add_trx_group_hash(
+    df: pd.DataFrame,
+    je_col: str = "전표번호",
+    coa_col: str = "계정과목코드",
+    engine: Literal["pandas", "duckdb"] = "pandas",
+) -> pd.DataFrame:
+    """df에 거래유형그룹_해시값 컬럼을 붙인 복사본을 반환 (노트북의 해시 생성 + merge 단계와 동일)."""
+    hashes = trx_group_hashes(df, je_col, coa_col, engine)
+    result = df.copy()
+    result[HASH_COLUMN] = df[je_col].map(hashes)
+    return result
+
+
+# --- 벤치마크 (노트북 구현 대비) ---
+if __name__ == "__main__":
+    import numpy as np
+
+    n_entries = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rng = np.random.default_rng(0)
+    lines_per_entry = rng.integers(2, 8, size=n_entries)
+    je_ids = np.repeat(np.arange(1, n_entries + 1), lines_per_entry)
+    code_pool = np.array(["10100", "20100", "40100", "0", "51100", "01200", "1,010.5", " 30100 ", "가나다라마바사아자차카"] + [None], dtype=object)
+    sample = pd.DataFrame({
+        "전표번호": je_ids,
+        "계정과목코드": code_pool[rng.integers(0, len(code_pool), size=len(je_ids))],
+    })
+    print(f"🧪 벤치마크: 전표 {n_entries:,}개 / {len(sample):,}행")
+
+    start = time.perf_counter()
+    reference = (
+        sample.groupby("전표번호")
+        .apply(generate_trx_group_hash, coa_col="계정과목코드")
+        .reset_index(name=HASH_COLUMN)
+    )
+    reference = sample.merge(reference, on="전표번호", how="left")[HASH_COLUMN]
+    baseline = time.perf_counter() - start
+    print(f"   notebook (groupby.apply + merge): {baseline:.2f}s ({len(sample) / baseline:,.0f} rows/s)")
+
+    for engine in ("pandas", "duckdb"):
+        start = time.perf_counter()
+        result = add_trx_group_hash(sample, engine=engine)[HASH_COLUMN]
+        elapsed = time.perf_counter() - start
+        same = result.equals(reference)
+        print(
+            f"   {engine:<6}: {elapsed:.2f}s ({len(sample) / elapsed:,.0f} rows/s, "
+            f"x{baseline / elapsed:.1f}) 결과 일치: {'✅' if same else '❌'}"
+        )